@@ -1,12 +1,14 @@
 # commands/dig.py
-from evennia import Command
+import re
+
+from evennia.commands.command import Command
 from evennia.utils import create
 from evennia.utils.search import search_object
 
-from typeclasses.exits import SmartExit, DIRECTIONS
+from typeclasses.exits import SmartExit, DIRECTIONS, exit_index, invalidate_exit_index
 from typeclasses.rooms import SmartRoom
 
-CARDINALS = set(DIRECTIONS.keys())
+_DBREF_RE = re.compile(r"#\d+")
 
 def _last_word(s: str) -> str:
     s = (s or "").strip()
@@ -17,25 +19,28 @@ def _last_word(s: str) -> str:
 def _find_exit(room, name: str):
     """Find exit by key or alias, case-insensitive."""
     low = name.lower()
-    for ex in room.exits:
-        if (ex.key or "").lower() == low:
-            return ex
-        if low in [a.lower() for a in ex.aliases.all()]:
-            return ex
-    return None
+    ex = exit_index(room)[0].get(low)
+    if ex is not None and ex.location != room:
+        # Exit hooks drop the index on every change, so a miss is trusted;
+        # only a hit that has since left the room forces a rebuild.
+        invalidate_exit_index(room)
+        ex = exit_index(room)[0].get(low)
+    return ex
 
 def _has_exit_to(room, keyname: str, destination):
-    low = keyname.lower()
-    for ex in room.exits:
-        if (ex.key or "").lower() == low and ex.destination == destination:
-            return ex
-    return None
+    """The exit in `room` named `keyname` that leads to `destination`, or None."""
+    key = (keyname.lower(), destination.id)
+    ex = exit_index(room)[1].get(key)
+    if ex is not None and not (ex.location == room and ex.destination == destination):
+        # dig deletes what this returns, so a hit that was moved or relinked
+        # since the index was built is re-checked against a fresh index.
+        invalidate_exit_index(room)
+        ex = exit_index(room)[1].get(key)
+    return ex
 
 def _compute_back_name(exitname: str, current_room_key: str) -> str:
-    low = exitname.lower()
-    if low in DIRECTIONS:
-        return DIRECTIONS[low]
-    return _last_word(current_room_key)
+    rev = DIRECTIONS.get(exitname.lower())
+    return rev if rev is not None else _last_word(current_room_key)
 
 def _resolve_target(caller, arg: str):
     """
@@ -46,7 +51,7 @@ def _resolve_target(caller, arg: str):
         return None, False, "Missing target."
 
     # dbref link
-    if arg.startswith("#") and arg[1:].isdigit():
+    if _DBREF_RE.fullmatch(arg):
         matches = search_object(arg)
         if not matches:
             return None, False, f"No object found for {arg}."
@@ -112,8 +117,8 @@ class CmdDigSmart(Command):
             # delete back link if it points back to this room
             removed_back = False
             if dest:
-                back_ex = _find_exit(dest, back_name)
-                if back_ex and back_ex.destination == room:
+                back_ex = _has_exit_to(dest, back_name, room)
+                if back_ex:
                     back_ex.delete()
                     removed_back = True
 
@@ -132,6 +137,7 @@ class CmdDigSmart(Command):
         # if exit exists, update it; else create it
         if existing:
             existing.destination = target
+            invalidate_exit_index(room)
             ex = existing
         else:
             ex = create.create_object(SmartExit, key=exitname, location=room, destination=target)
@@ -17,6 +17,17 @@ at_server_cold_stop()
 
 """
 
+import os
+
+# LLM calls (and room image generation) go through deferToThread, i.e. the
+# reactor's thread pool, whose default cap is 10. Those calls spend nearly
+# all their time waiting on HTTP, so workers are cheap compared to cores and
+# a busy server would otherwise queue whole LLM round trips behind each
+# other. Raising the cap costs an idle thread's memory, not CPU; mostly it
+# lets more requests hit the LLM server at once, so lower LLM_MAX_PARALLEL
+# if a local model server can't take that many in parallel.
+LLM_MAX_PARALLEL = int(os.getenv("LLM_MAX_PARALLEL", str(max(20, (os.cpu_count() or 4) * 5))))
+
 
 def at_server_init():
     """
@@ -30,7 +41,9 @@ def at_server_start():
     This is called every time the server starts up, regardless of
     how it was shut down.
     """
-    pass
+    from twisted.internet import reactor
+
+    reactor.suggestThreadPoolSize(LLM_MAX_PARALLEL)
 
 
 def at_server_stop():
@@ -0,0 +1,131 @@
+"""
+Tests for the exit lookups behind the dig command (commands/dig.py) and the
+per-room exit index they read (typeclasses/exits.py).
+
+Rooms and exits are small fakes; only the alias query behind the index is
+patched, so no database is needed.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeExit:
+    def __init__(self, key, location, destination, aliases=()):
+        self.key = key
+        self.id = id(self)
+        self.location = location
+        self.destination = destination
+        self.aliases_list = [a.lower() for a in aliases]
+        self.ndb = SimpleNamespace(lower_aliases=None)
+        self.deleted = False
+        location.exits.append(self)
+
+    @property
+    def db_destination_id(self):
+        return self.destination.id if self.destination else None
+
+    @property
+    def lower_aliases(self):
+        return frozenset(self.aliases_list)
+
+    def delete(self):
+        self.deleted = True
+        self.location.exits.remove(self)
+
+
+class FakeRoom:
+    def __init__(self, key):
+        self.key = key
+        self.id = id(self)
+        self.exits = []
+        self.ndb = SimpleNamespace(exit_index=None)
+
+
+@pytest.fixture
+def dig(monkeypatch):
+    import commands.dig as dig
+    import typeclasses.exits as exits
+
+    monkeypatch.setattr(
+        exits, "_aliases_by_exit", lambda exs: {ex.id: list(ex.aliases_list) for ex in exs}
+    )
+    return dig
+
+
+def test_exit_index_maps_keys_aliases_and_destinations(dig):
+    from typeclasses.exits import exit_index
+
+    hall, kitchen = FakeRoom("Hall"), FakeRoom("Kitchen")
+    north = FakeExit("North", hall, kitchen, aliases=("N",))
+
+    by_name, by_name_dest = exit_index(hall)
+    assert by_name == {"north": north, "n": north}
+    assert by_name_dest == {("north", kitchen.id): north}
+    assert north.ndb.lower_aliases == frozenset({"n"})
+    assert exit_index(hall) is hall.ndb.exit_index  # built once, then reused
+
+
+def test_find_exit_misses_until_an_exit_hook_drops_the_index(dig):
+    hall, kitchen = FakeRoom("Hall"), FakeRoom("Kitchen")
+    assert dig._find_exit(hall, "north") is None  # index built while the room has no exits
+
+    north = FakeExit("North", hall, kitchen, aliases=("n",))
+    assert dig._find_exit(hall, "north") is None  # a miss is trusted: no scan
+
+    dig.invalidate_exit_index(hall)  # what Exit.at_object_creation does
+    assert dig._find_exit(hall, "n") is north
+    assert dig._find_exit(hall, "NORTH") is north
+    assert dig._find_exit(hall, "east") is None
+
+
+def test_find_exit_drops_a_stale_hit(dig):
+    hall, kitchen, cellar = FakeRoom("Hall"), FakeRoom("Kitchen"), FakeRoom("Cellar")
+    north = FakeExit("North", hall, kitchen)
+    assert dig._find_exit(hall, "north") is north
+
+    # moved away without at_post_move firing
+    hall.exits.remove(north)
+    north.location = cellar
+    cellar.exits.append(north)
+
+    assert dig._find_exit(hall, "north") is None
+
+
+def test_has_exit_to_rejects_a_relinked_back_exit(dig):
+    hall, kitchen, cellar = FakeRoom("Hall"), FakeRoom("Kitchen"), FakeRoom("Cellar")
+    back = FakeExit("South", kitchen, hall)
+    assert dig._has_exit_to(kitchen, "south", hall) is back
+
+    back.destination = cellar  # relinked without the index noticing
+    assert dig._has_exit_to(kitchen, "south", hall) is None
+
+    # the rebuilt index still finds a real return link
+    again = FakeExit("south", kitchen, hall)
+    dig.invalidate_exit_index(kitchen)  # what Exit.at_object_creation does
+    assert dig._has_exit_to(kitchen, "South", hall) is again
+
+
+def test_alias_writes_clear_cached_aliases_and_room_index(dig, monkeypatch):
+    from evennia.typeclasses.tags import AliasHandler
+    from typeclasses.exits import Exit, _ExitAliasHandler
+
+    writes = []
+    for name in ("add", "remove", "clear"):
+        monkeypatch.setattr(AliasHandler, name, lambda self, *a, _n=name, **kw: writes.append(_n))
+
+    hall, kitchen = FakeRoom("Hall"), FakeRoom("Kitchen")
+    north = FakeExit("North", hall, kitchen)
+    north.__dbclass__ = type("ObjectDB", (), {})
+    # the handler Exit.aliases builds, not one constructed by hand
+    handler = Exit.aliases.func(north)
+    assert isinstance(handler, _ExitAliasHandler)
+
+    for write in (lambda: handler.add("n"), lambda: handler.remove("n"), handler.clear):
+        north.ndb.lower_aliases = frozenset({"stale"})
+        hall.ndb.exit_index = ({}, {})
+        write()
+        assert north.ndb.lower_aliases is None
+        assert hall.ndb.exit_index is None
+    assert writes == ["add", "remove", "clear"]
@@ -0,0 +1,32 @@
+# tests/utils/fakes.py
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class FakeDb:
+    """
+    Slotted stand-in for an Evennia `obj.db` AttributeHandler in unit tests.
+    Unset attributes read as None, like Evennia's db handler.
+    """
+    desc: Any = None
+    memory: Any = None
+    director_facts: Any = None
+    last_generated_desc: Any = None
+    notable: Any = None
+    shortdesc: Any = None
+    affordance: Any = None
+    facts: Any = None
+
+
+def saver_list(items):
+    """
+    A detached Evennia _SaverList built from `items`, the way a persisted
+    Attribute comes back: nested dicts/lists become _SaverDict/_SaverList.
+    """
+    from evennia.utils.dbserialize import _SaverList
+
+    out = _SaverList()
+    for item in items:
+        out.append(item)
+    return out
@@ -27,6 +27,15 @@ def test_default_affordance_custom_unit():
     assert a["unit"] == "kg"
 
 
+def test_default_affordance_copies_never_share_mutable_parts():
+    a, b = af.default_affordance(), af.default_affordance()
+    a["container"]["is_open"] = False
+    a["manipulations"].append("shake")
+    assert b["container"]["is_open"] is True
+    assert b["manipulations"] == ["pick up", "examine"]
+    assert af.default_affordance() == b
+
+
 def test_ensure_affordance_creates_when_missing():
     obj = FakeObj(affordance_value=None)
     out = af.ensure_affordance(obj)
@@ -88,3 +97,26 @@ def test_ensure_affordance_custom_unit_applied_on_creation():
     obj = FakeObj(affordance_value=None)
     out = af.ensure_affordance(obj, unit="kg")
     assert out["unit"] == "kg"
+
+
+def test_ensure_affordance_leaves_complete_affordance_unsaved():
+    class CountingDb:
+        def __init__(self, value):
+            object.__setattr__(self, "writes", 0)
+            object.__setattr__(self, "affordance", value)
+
+        def __setattr__(self, name, value):
+            object.__setattr__(self, "writes", self.writes + 1)
+            object.__setattr__(self, name, value)
+
+    complete = af.default_affordance()
+    obj = SimpleNamespace(db=CountingDb(complete))
+
+    assert af.ensure_affordance(obj) is complete
+    assert obj.db.writes == 0
+
+    obj.db.affordance = {"weight": 2.0}
+    obj.db.writes = 0
+    out = af.ensure_affordance(obj)
+    assert out["weight"] == 2.0 and "container" in out
+    assert obj.db.writes == 1
@@ -2,6 +2,10 @@
 import json
 from types import SimpleNamespace
 
+import pytest
+
+from tests.utils.fakes import FakeDb
+
 import utils.computer as comp
 
 
@@ -14,7 +18,7 @@ class FakeRoom:
         self.OPENAI_API_KEY = ""
         self.contents = []
         self.key = "Test Room"
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             desc="",
             memory=[],
             director_facts=[],
@@ -173,3 +177,121 @@ def test_chat_json_delegates_to_client(monkeypatch):
     msgs = [{"role": "system", "content": "test"}]
     result = c._chat_json(msgs)
     assert result == {"result": "ok"}
+
+
+def test_client_is_built_once_per_computer(monkeypatch):
+    r = FakeRoom()
+    c = comp.Computer(r)
+
+    built = []
+    def fake_builder():
+        client = SimpleNamespace(
+            timeout_s=180.0,
+            max_attempts=2,
+            chat_json=lambda providers, msgs: {"ok": True},
+        )
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(comp, "build_default_client_from_env", fake_builder)
+
+    c._chat_json([{"role": "user", "content": "a"}])
+    c._chat_json([{"role": "user", "content": "b"}])
+    assert len(built) == 1
+
+    # The director client gets its own instance so its knobs don't leak.
+    assert c._director_client.timeout_s == 120.0
+    assert c._director_client.max_attempts == 1
+    assert c._client.timeout_s == 180.0
+
+
+def test_llm_providers_memoized_until_key_changes(monkeypatch):
+    fake_settings = SimpleNamespace(
+        LOCAL_BASE_URL="http://test/v1",
+        LOCAL_MODEL="test-model",
+        OPENAI_API_KEY=None,
+    )
+    monkeypatch.setattr(comp, "settings", fake_settings, raising=False)
+    c = comp.Computer(FakeRoom())
+
+    first = c.llm_providers()
+    assert c.llm_providers() is first
+
+    fake_settings.OPENAI_API_KEY = "sk-new"
+    assert [p.label for p in c.llm_providers()] == ["LOCAL", "OPENAI"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_json_safe_handles_leaves_and_odd_containers(monkeypatch, use_orjson):
+    from collections import UserDict, UserList
+
+    if not use_orjson:
+        monkeypatch.setattr(comp, "orjson", None)
+    elif comp.orjson is None:
+        pytest.skip("orjson not installed")
+
+    payload = {
+        "b": b"bin",
+        "saver_dict": UserDict({1: b"x"}),
+        "saver_list": UserList([b"y", 2]),
+        "weird": object.__new__(type("Weird", (), {"__str__": lambda self: "<w>"})),
+    }
+    out = json.loads(comp._dumps_json_safe(payload))
+    assert out == {"b": "bin", "saver_dict": {"1": "x"}, "saver_list": ["y", 2], "weird": "<w>"}
+
+    # non-string keys the encoder rejects fall back to the full walk
+    assert json.loads(comp._dumps_json_safe({b"k": 1})) == {"b'k'": 1}
+
+
+def test_room_memory_text_tail_matches_full_join():
+    r = FakeRoom()
+    r.db.memory = [{"who": f"P{i}", "msg": "m" * (i % 7)} for i in range(200)]
+    full = "\n".join(f'{m["who"]}: {m["msg"]}' for m in r.db.memory)
+    c = comp.Computer(r)
+
+    for n in (1, 5, 6, 7, 50, 333, len(full), len(full) + 10):
+        assert c.room_memory_text(max_chars=n) == full[-n:]
+
+
+def test_room_memory_text_prefers_live_ndb_buffer():
+    from collections import deque
+
+    r = FakeRoom()
+    r.db.memory = [{"who": "Old", "msg": "saved"}]
+    r.ndb = SimpleNamespace(memory=deque([{"who": "A", "msg": "hi"}, {"who": "B", "msg": "yo"}], maxlen=50))
+    assert comp.Computer(r).room_memory_text() == "A: hi\nB: yo"
+
+    r.ndb.memory = None  # buffer not built yet: fall back to the saved list
+    assert comp.Computer(r).room_memory_text() == "Old: saved"
+
+
+def test_json_safe_returns_already_safe_containers_unchanged():
+    inner = {"k": ["a", 1, None]}
+    data = {"x": inner, "y": [1.5, True]}
+    assert comp._json_safe(data) is data
+
+    mixed = {"safe": inner, "bin": b"z"}
+    out = comp._json_safe(mixed)
+    assert out is not mixed
+    assert out["safe"] is inner
+    assert out["bin"] == "z"
+
+    # tuples still come back as lists
+    assert comp._json_safe(("a",)) == ["a"]
+
+
+def test_deferred_wrappers_dispatch_to_thread_pool(monkeypatch):
+    calls = []
+    monkeypatch.setattr(comp, "deferToThread", lambda fn, *a: calls.append((fn.__name__, a)) or "d")
+    c = comp.Computer(FakeRoom())
+
+    assert c.generate_room_desc_deferred({"room_key": "R"}) == "d"
+    assert c.predict_intent_deferred("Bob", "make tea") == "d"
+    assert c.generate_prop_json_deferred("Bob", "a brass cat") == "d"
+    assert c.generate_prop_edit_json_deferred("Bob", "paint it", "#4") == "d"
+    assert calls == [
+        ("generate_room_desc_safe", ({"room_key": "R"},)),
+        ("predict_intent", ("Bob", "make tea")),
+        ("generate_prop_json", ("Bob", "a brass cat")),
+        ("generate_prop_edit_json", ("Bob", "paint it", "#4")),
+    ]
@@ -1,6 +1,8 @@
 # tests/utils/test_computer_director_pipeline.py
 from types import SimpleNamespace
 
+from tests.utils.fakes import FakeDb
+
 import utils.computer as comp
 
 
@@ -13,7 +15,7 @@ class FakeRoom:
         self.OPENAI_API_KEY = ""
         self.key = "Test Room"
         self.contents = []
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             desc="ROOM DESC",
             memory=[],
             director_facts=[],
@@ -1,6 +1,7 @@
 # tests/utils/test_computer_llm_calls.py
 import json
-from types import SimpleNamespace
+
+from tests.utils.fakes import FakeDb
 
 import utils.computer as comp
 import utils.room_object_query as roq
@@ -11,7 +12,7 @@ class FakeObj:
         self.key = key
         self.dbref = dbref
         self._kind = kind
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             shortdesc=shortdesc,
             desc=desc,
             notable=notable,
@@ -28,7 +29,7 @@ class FakeRoom:
         self.OPENAI_API_KEY = ""
         self.key = "Test Room"
         self.contents = []
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             desc="ROOM DESC",
             memory=[{"who": "A", "msg": "hello"}],
             director_facts=[],
@@ -1,5 +1,5 @@
 # tests/utils/test_computer_packets.py
-from types import SimpleNamespace
+from tests.utils.fakes import FakeDb
 
 import utils.computer as comp
 import utils.room_object_query as roq
@@ -10,7 +10,7 @@ class FakeObj:
         self.key = key
         self.dbref = dbref
         self._kind = kind
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             shortdesc=shortdesc,
             desc=desc,
             notable=notable,
@@ -27,7 +27,7 @@ class FakeRoom:
         self.OPENAI_API_KEY = ""
         self.key = "Test Room"
         self.contents = []
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             desc="ROOM DESC",
             memory=[],
             director_facts=[" fact1 ", "", "fact2"],
@@ -138,3 +138,59 @@ def test_director_snapshot_calls_build_snapshot_with_clean_facts(monkeypatch):
     assert captured["objects"] == [
         {"key": "Lamp", "shortdesc": "a lamp", "desc": "desc", "notable": True}
     ]
+
+
+def test_notable_objects_packet_sees_attribute_edits_on_every_call(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    ensured = []
+    monkeypatch.setattr(comp, "ensure_affordance", lambda obj: ensured.append(obj.dbref))
+    monkeypatch.setattr(comp, "get_facts", lambda obj: [])
+
+    r = FakeRoom()
+    lamp = FakeObj("Lamp", "#4", shortdesc="a lamp", desc="  bright  ", notable=True)
+    r.contents = [lamp]
+    c = comp.Computer(r)
+
+    assert c.notable_objects_packet(include_desc=True)[0]["desc"] == "bright"
+    assert c.notable_objects_packet(include_desc=False)[0]["desc"] == ""
+
+    # an in-place edit on a Computer held across requests is not served stale
+    lamp.key = "Brass Lamp"
+    lamp.db.shortdesc = "a brass lamp"
+    assert c.notable_anchors() == [{"key": "Brass Lamp", "shortdesc": "a brass lamp", "dbref": "#4"}]
+
+    r.contents = [lamp, FakeObj("Sofa", "#5", shortdesc="a sofa", notable=True)]
+    assert [p["dbref"] for p in c.notable_objects_packet()] == ["#4", "#5"]
+    assert ensured == ["#4", "#4", "#4", "#4", "#5"]
+
+
+def test_director_snapshot_decodes_bytes_facts(monkeypatch):
+    monkeypatch.setattr(comp.Computer, "notable_objects_packet", lambda *_a, **_kw: [])
+    monkeypatch.setattr(comp.Computer, "room_memory_text", lambda self, max_chars=3000: "")
+
+    captured = {}
+    monkeypatch.setattr(comp, "build_snapshot", lambda **kw: captured.update(kw))
+
+    r = FakeRoom()
+    r.db.director_facts = [b" salty air ", "  ", 3]
+    comp.Computer(r).director_snapshot()
+    assert captured["facts"] == ["salty air", "3"]
+
+
+def test_notable_anchors_are_slim_and_match_packet(monkeypatch):
+    patch_inherits_from(monkeypatch)
+    monkeypatch.setattr(comp, "ensure_affordance", lambda obj: None)
+    monkeypatch.setattr(comp, "get_facts", lambda obj: [])
+
+    r = FakeRoom()
+    r.contents = [
+        FakeObj("Lamp", "#4", shortdesc="a lamp", desc="d", notable=True),
+        FakeObj("Rug", "#5", desc="d", notable=True),
+    ]
+    c = comp.Computer(r)
+
+    assert c.notable_anchors() == [
+        {"key": "Lamp", "shortdesc": "a lamp", "dbref": "#4"},
+        {"key": "Rug", "shortdesc": "Rug", "dbref": "#5"},
+    ]
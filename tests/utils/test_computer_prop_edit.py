@@ -1,6 +1,7 @@
 # tests/utils/test_computer_prop_edit.py
 import json
-from types import SimpleNamespace
+
+from tests.utils.fakes import FakeDb, saver_list
 
 import utils.computer as comp
 
@@ -12,7 +13,7 @@ class FakeObj:
         self.key = key
         self.dbref = dbref
         self._kind = kind
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             shortdesc=shortdesc,
             desc=desc,
             notable=notable,
@@ -29,7 +30,7 @@ class FakeRoom:
         self.OPENAI_API_KEY = ""
         self.key = "Test Room"
         self.contents = []
-        self.db = SimpleNamespace(
+        self.db = FakeDb(
             desc="ROOM DESC",
             memory=[{"who": "A", "msg": "hello"}],
             director_facts=["dir1", "dir2"],
@@ -168,3 +169,45 @@ def test_generate_prop_edit_json_uses_json_safe(monkeypatch):
     payload = json.loads(rc.calls[0]["messages"][1]["content"])
     # bytes were stringified safely
     assert "dirbytes" in "".join(payload["room_facts"])
+
+
+def test_generate_prop_edit_json_includes_persisted_room_facts(monkeypatch):
+    patch_inherits_from(monkeypatch)
+    monkeypatch.setattr(comp, "ensure_affordance", lambda obj: None)
+
+    r = FakeRoom()
+    r.db.facts = saver_list([{"id": "fact_abc", "text": "pinned-room-1"}])
+    r.contents = [FakeObj("Lamp", "#10", shortdesc="a lamp", desc="old", notable=True)]
+
+    rc = RecordingClient(reply={"dbref": "#10", "key": "Lamp", "shortdesc": "a lamp", "desc": "new"})
+    monkeypatch.setattr(comp, "build_default_client_from_env", lambda: rc)
+
+    comp.Computer(r).generate_prop_edit_json("Player", "change it", target_dbref="#10")
+
+    payload = json.loads(rc.calls[0]["messages"][1]["content"])
+    assert payload["room_facts"] == ["pinned-room-1", "dir1", "dir2"]
+
+
+def test_generate_prop_edit_json_reads_target_facts_once(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    room = FakeRoom()
+    lamp = FakeObj("Lamp", "#10", shortdesc="a lamp", desc="old", notable=True)
+    room.contents = [lamp]
+
+    calls = []
+    def fake_get_facts(obj):
+        calls.append(obj)
+        return [] if obj is room else [{"text": "shiny"}]
+
+    monkeypatch.setattr(comp, "ensure_affordance", lambda obj: None)
+    monkeypatch.setattr(comp, "get_facts", fake_get_facts)
+
+    rc = RecordingClient(reply={"dbref": "#10"})
+    monkeypatch.setattr(comp, "build_default_client_from_env", lambda: rc)
+
+    comp.Computer(room).generate_prop_edit_json("Player", "change the lamp", target_dbref="#10")
+
+    payload = json.loads(rc.calls[0]["messages"][1]["content"])
+    assert payload["target"]["facts"] == [{"text": "shiny"}]
+    assert calls.count(lamp) == 1
@@ -3,6 +3,7 @@ import time
 from types import SimpleNamespace
 
 import utils.facts as facts
+from tests.utils.fakes import saver_list
 
 
 class FakeObj:
@@ -41,6 +42,13 @@ def test_new_fact_defaults():
     assert f["created_by"] == ""
 
 
+def test_new_fact_ids_are_short_hex_and_distinct():
+    ids = {facts.new_fact("x")["id"] for _ in range(50)}
+
+    assert len(ids) == 50
+    assert all(len(i) == len("fact_") + 6 and int(i[5:], 16) >= 0 for i in ids)
+
+
 def test_add_fact_initializes_list_when_missing():
     obj = FakeObj(facts_value=None)
     f = {"id": "fact_1", "text": "hello"}
@@ -57,6 +65,24 @@ def test_add_fact_overwrites_non_list_storage():
     assert obj.db.facts == [f]
 
 
+def test_add_fact_caps_by_dropping_weakest_oldest():
+    stored = [
+        {"id": "a", "strength": 1.0},
+        {"id": "b", "strength": 0.6},
+        {"id": "c", "strength": 0.3},
+        {"id": "d", "strength": 0.6},
+        {"id": "e"},  # missing strength counts as weakest
+    ]
+    obj = FakeObj(facts_value=stored)
+
+    facts.add_fact(obj, {"id": "new", "strength": 0.1}, max_facts=3)
+    assert [f["id"] for f in obj.db.facts] == ["a", "d", "new"]
+    assert len(stored) == 5  # stored list replaced, not mutated in place
+
+    facts.add_fact(obj, {"id": "n2", "strength": 0.1}, max_facts=3)
+    assert [f["id"] for f in obj.db.facts] == ["a", "d", "n2"]
+
+
 def test_get_facts_returns_list_or_empty():
     assert facts.get_facts(FakeObj(facts_value=None)) == []
     assert facts.get_facts(FakeObj(facts_value={"x": 1})) == []
@@ -65,6 +91,28 @@ def test_get_facts_returns_list_or_empty():
     assert facts.get_facts(FakeObj(facts_value=lst)) is lst
 
 
+def test_facts_accept_saver_style_sequences():
+    from collections import UserList
+
+    stored = UserList([{"id": "fact_1", "text": "a"}])  # stands in for _SaverList
+    obj = FakeObj(facts_value=stored)
+
+    assert facts.get_facts(obj) is stored
+    facts.add_fact(obj, {"id": "fact_2", "text": "b"})
+    assert facts.fact_texts(obj) == ["a", "b"]
+    assert facts.remove_fact(obj, "fact_1") is True
+    assert obj.db.facts == [{"id": "fact_2", "text": "b"}]
+
+
+def test_fact_texts_read_persisted_saver_values():
+    stored = saver_list([{"id": "fact_abc", "text": " hello "}, {"id": "fact_def", "text": ""}])
+    assert type(stored[0]).__name__ == "_SaverDict"  # a Mapping, not a dict
+    obj = FakeObj(facts_value=stored)
+
+    assert facts.get_facts(obj) is stored
+    assert facts.fact_texts(obj) == ["hello"]
+
+
 def test_remove_fact_success_and_failure():
     f1 = {"id": "fact_1", "text": "a"}
     f2 = {"id": "fact_2", "text": "b"}
@@ -80,6 +128,24 @@ def test_remove_fact_success_and_failure():
     assert obj.db.facts == [f2]
 
 
+def test_remove_fact_miss_does_not_rewrite_or_report_junk():
+    junk = "not a dict"
+    stored = [junk, {"id": "fact_2", "text": "b"}]
+    obj = FakeObj(facts_value=stored)
+
+    assert facts.remove_fact(obj, "fact_1") is False
+    assert obj.db.facts is stored
+
+
+def test_remove_fact_matches_persisted_saver_dict():
+    stored = saver_list([{"id": "fact_abc", "text": "hello"}, {"id": "fact_def", "text": "bye"}])
+    obj = FakeObj(facts_value=stored)
+
+    assert facts.remove_fact(obj, "fact_abc") is True
+    assert obj.db.facts == [{"id": "fact_def", "text": "bye"}]
+    assert facts.remove_fact(obj, "fact_abc") is False
+
+
 def test_remove_fact_non_list_storage_is_safe():
     obj = FakeObj(facts_value={"bad": "data"})
     assert facts.remove_fact(obj, "fact_1") is False
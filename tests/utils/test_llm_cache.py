@@ -0,0 +1,34 @@
+# tests/utils/test_llm_cache.py
+import utils.llm_cache as lc
+
+
+def test_response_key_depends_on_prompt_and_models():
+    k = lc.response_key('{"a":1}', ["m1"])
+    assert k == lc.response_key('{"a":1}', ["m1"])
+    assert k != lc.response_key('{"a":2}', ["m1"])
+    assert k != lc.response_key('{"a":1}', ["m2"])
+    assert k != lc.response_key('{"a":1}', ["m1", "m2"])
+    assert len(k) == 32
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    c = lc.TTLCache(max_entries=2, ttl_s=60)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # touch: b is now the oldest
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert len(c) == 2
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(lc.time, "monotonic", lambda: now[0])
+    c = lc.TTLCache(ttl_s=5)
+    c.put("k", "v")
+    now[0] = 104.9
+    assert c.get("k") == "v"
+    now[0] = 105.0
+    assert c.get("k") is None
+    assert len(c) == 0
@@ -1,7 +1,10 @@
 # tests/utils/test_llm_client.py
+import json as _json
 import os
 from dataclasses import replace
 
+import pytest
+
 import utils.llm_client as llm
 
 
@@ -33,7 +36,10 @@ class FakeHTTPXClient:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def post(self, url, headers=None, json=None):
+    def post(self, url, headers=None, json=None, content=None):
+        if content is not None:
+            # body pre-encoded as bytes (orjson path)
+            json = _json.loads(content)
         self.posts.append({"url": url, "headers": headers or {}, "json": json})
         if not self._responses:
             return FakeResponse(status_code=500, text="No scripted responses")
@@ -66,6 +72,16 @@ def test_extract_json_strict_dict(monkeypatch):
     assert logs == []
 
 
+def test_extract_json_strict_dict_skips_fallbacks(monkeypatch):
+    c = llm.LLMClient()
+
+    def boom(_text):
+        raise AssertionError("fallback should not run for strict JSON")
+
+    monkeypatch.setattr(c, "_strip_thinking_tags", boom)
+    assert c._extract_json_from_text('  {"a": {"b": 2}}\n', label="t") == {"a": {"b": 2}}
+
+
 def test_extract_json_nested_object(monkeypatch):
     """Model returns nested JSON like {"object": {"key": "X", "desc": "Y"}}"""
     logs = []
@@ -102,6 +118,30 @@ def test_extract_json_embedded_object(monkeypatch):
     assert logs == []
 
 
+def test_extract_json_greedy_span_keeps_nested_objects(monkeypatch):
+    patch_logger(monkeypatch, [])
+
+    c = llm.LLMClient()
+    out = c._extract_json_from_text('Sure! {"a": {"b": [1, {"c": 2}]}} Hope that helps.', label="t")
+    assert out == {"a": {"b": [1, {"c": 2}]}}
+
+
+def test_extract_json_ignores_braces_in_trailing_prose(monkeypatch):
+    patch_logger(monkeypatch, [])
+
+    c = llm.LLMClient()
+    out = c._extract_json_from_text('{"a": {"b": 1}} (use {curly} braces next time}', label="t")
+    assert out == {"a": {"b": 1}}
+
+
+def test_extract_json_accepts_nan_that_the_fast_decoder_rejects(monkeypatch):
+    patch_logger(monkeypatch, [])
+
+    c = llm.LLMClient()
+    out = c._extract_json_from_text('{"w": NaN, "k": "x"}', label="t")
+    assert out["k"] == "x" and out["w"] != out["w"]
+
+
 def test_extract_json_none_logs_and_returns_none(monkeypatch):
     logs = []
     patch_logger(monkeypatch, logs)
@@ -121,6 +161,22 @@ def test_extract_json_no_object_logs(monkeypatch):
     assert any("No JSON object found" in m for m in logs)
 
 
+def test_extract_json_passes_through_decoded_dict_and_skips_braceless_text(monkeypatch):
+    logs = []
+    patch_logger(monkeypatch, logs)
+
+    c = llm.LLMClient()
+    reply = {"a": 1}
+    assert c._extract_json_from_text(reply, label="t") is reply
+
+    def boom(_text):
+        raise AssertionError("fallbacks should not run without a brace")
+
+    monkeypatch.setattr(c, "_strip_thinking_tags", boom)
+    assert c._extract_json_from_text("just prose", label="t") is None
+    assert any("No JSON object found" in m for m in logs)
+
+
 def test_extract_json_bad_candidate_logs(monkeypatch):
     logs = []
     patch_logger(monkeypatch, logs)
@@ -136,12 +192,84 @@ def test_build_default_client_from_env(monkeypatch):
     monkeypatch.setenv("LLM_MAX_ATTEMPTS", "7")
     monkeypatch.setenv("LLM_TEMPERATURE", "0.9")
     monkeypatch.setenv("LLM_NO_TEMPERATURE_MODELS", "gpt-5-mini,foo, bar  ")
+    monkeypatch.delenv("LLM_JSON_MODE_MODELS", raising=False)
 
     c = llm.build_default_client_from_env()
     assert c.timeout_s == 12.5
     assert c.max_attempts == 7
     assert c.temperature == 0.9
     assert c.no_temperature_models == {"gpt-5-mini", "foo", "bar"}
+    assert c.json_mode_models == frozenset()
+
+    monkeypatch.setenv("LLM_JSON_MODE_MODELS", "gpt-4.1-mini, ")
+    assert llm.build_default_client_from_env().json_mode_models == {"gpt-4.1-mini"}
+
+
+def test_build_default_client_backoff_knobs(monkeypatch):
+    monkeypatch.setenv("LLM_BASE_DELAY_S", "0.5")
+    monkeypatch.setenv("LLM_MAX_BACKOFF_S", "2")
+
+    c = llm.build_default_client_from_env()
+    assert c.base_delay_s == 0.5
+    assert c.max_backoff_s == 2.0
+
+
+def test_backoff_delay_is_decorrelated_and_capped(monkeypatch):
+    c = llm.LLMClient(base_delay_s=0.25, max_backoff_s=1.0)
+
+    monkeypatch.setattr(llm.random, "random", lambda: 0.0)
+    assert c._backoff_delay(0.25) == 0.25
+
+    monkeypatch.setattr(llm.random, "random", lambda: 1.0)
+    assert c._backoff_delay(0.25) == 0.75
+    assert c._backoff_delay(0.75) == 1.0
+
+
+def test_retry_sleeps_only_between_attempts(monkeypatch):
+    patch_logger(monkeypatch, [])
+    sleeps = []
+    monkeypatch.setattr(llm.time, "sleep", lambda s: sleeps.append(s))
+    monkeypatch.setattr(llm.random, "random", lambda: 0.0)
+    patch_httpx_client(monkeypatch, FakeHTTPXClient([FakeResponse(500), FakeResponse(500)]))
+
+    provider = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key=None)
+    c = llm.LLMClient(max_attempts=2)
+
+    assert c._call_chat_completions_json(provider, [{"role": "user", "content": "hi"}]) is None
+    assert sleeps == [0.25]
+
+
+def test_retry_honors_short_retry_after(monkeypatch):
+    patch_logger(monkeypatch, [])
+    sleeps = []
+    monkeypatch.setattr(llm.time, "sleep", lambda s: sleeps.append(s))
+    monkeypatch.setattr(llm.random, "random", lambda: 0.0)
+    throttled = FakeResponse(429)
+    throttled.headers = {"Retry-After": "2"}
+    ok = FakeResponse(json_data={"choices": [{"message": {"content": '{"a": 1}'}}]})
+    patch_httpx_client(monkeypatch, FakeHTTPXClient([throttled, ok]))
+
+    provider = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key=None)
+    c = llm.LLMClient(max_attempts=2)
+    assert c._call_chat_completions_json(provider, [{"role": "user", "content": "hi"}]) == {"a": 1}
+    assert sleeps == [2.0]
+
+
+def test_retry_after_beyond_backoff_cap_gives_up_on_provider(monkeypatch):
+    patch_logger(monkeypatch, [])
+    monkeypatch.setattr(llm.logger, "log_warn", lambda _msg: None)
+    sleeps = []
+    monkeypatch.setattr(llm.time, "sleep", lambda s: sleeps.append(s))
+    throttled = FakeResponse(503)
+    throttled.headers = {"Retry-After": "120"}
+    fake_http = FakeHTTPXClient([throttled])
+    patch_httpx_client(monkeypatch, fake_http)
+
+    provider = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key=None)
+    c = llm.LLMClient(max_attempts=3, max_backoff_s=5.0)
+    assert c._call_chat_completions_json(provider, [{"role": "user", "content": "hi"}]) is None
+    assert sleeps == []
+    assert len(fake_http.posts) == 1
 
 
 def test_call_omits_temperature_for_no_temperature_model(monkeypatch):
@@ -191,6 +319,22 @@ def test_call_includes_temperature_for_other_models(monkeypatch):
     assert sent["temperature"] == 0.33
 
 
+def test_call_requests_json_mode_only_for_listed_models(monkeypatch):
+    patch_logger(monkeypatch, [])
+    patch_sleep_and_random(monkeypatch)
+    ok = {"choices": [{"message": {"content": '{"ok": true}'}}]}
+    fake_http = FakeHTTPXClient([FakeResponse(json_data=ok), FakeResponse(json_data=ok)])
+    patch_httpx_client(monkeypatch, fake_http)
+
+    c = llm.LLMClient(max_attempts=1, json_mode_models={"gpt-4.1-mini"})
+    for model in ("gpt-4.1-mini", "local-model"):
+        provider = llm.LLMProvider(label="p", base_url="http://x/v1", model=model)
+        assert c._call_chat_completions_json(provider, [{"role": "user", "content": "hi"}]) == {"ok": True}
+
+    assert fake_http.posts[0]["json"]["response_format"] == {"type": "json_object"}
+    assert "response_format" not in fake_http.posts[1]["json"]
+
+
 def test_retry_then_success(monkeypatch):
     logs = []
     patch_logger(monkeypatch, logs)
@@ -245,6 +389,47 @@ def test_chat_json_tries_providers_in_order(monkeypatch):
     out = c.chat_json([a, b], [{"role": "user", "content": "hi"}])
     assert out == {"win": True}
 
+def test_chat_json_serves_repeat_prompts_from_response_cache(monkeypatch):
+    patch_logger(monkeypatch, [])
+    patch_sleep_and_random(monkeypatch)
+    ok = {"choices": [{"message": {"content": '{"a": 1}'}}]}
+    fake_http = FakeHTTPXClient([FakeResponse(json_data=ok), FakeResponse(json_data=ok)])
+    patch_httpx_client(monkeypatch, fake_http)
+
+    p = llm.LLMProvider(label="p", base_url="http://x/v1", model="m")
+    c = llm.LLMClient(max_attempts=1, temperature=0, response_cache=llm.TTLCache())
+
+    assert c.chat_json([p], [{"role": "user", "content": "hi"}]) == {"a": 1}
+    assert c.chat_json([p], [{"role": "user", "content": "hi"}]) == {"a": 1}
+    assert len(fake_http.posts) == 1
+
+    c.chat_json([p], [{"role": "user", "content": "other"}])
+    assert len(fake_http.posts) == 2
+
+
+def test_provider_cache_identity_leaves_out_api_key():
+    p = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key="sk-secret")
+    assert p.cache_identity == "p|http://x/v1|m"
+    assert p.cache_identity is p.cache_identity
+    assert p == llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key="sk-secret")
+
+
+def test_build_default_client_caches_only_deterministic_replies(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_FORCE", raising=False)
+    monkeypatch.setenv("LLM_TEMPERATURE", "0.6")
+    assert llm.build_default_client_from_env().response_cache is None
+
+    monkeypatch.setenv("LLM_TEMPERATURE", "0")
+    c1 = llm.build_default_client_from_env()
+    c2 = llm.build_default_client_from_env()
+    assert c1.response_cache is not None
+    assert c1.response_cache is c2.response_cache
+
+    monkeypatch.setenv("LLM_TEMPERATURE", "0.6")
+    monkeypatch.setenv("LLM_CACHE_FORCE", "1")
+    assert llm.build_default_client_from_env().response_cache is c1.response_cache
+
+
 def test_chat_json_logs_provider_level_exception_and_raises(monkeypatch):
     logs = []
     patch_logger(monkeypatch, logs)
@@ -325,3 +510,111 @@ def test_call_sets_last_err_json_parse_failed_when_extraction_returns_none(monke
 
     # This proves we hit the "JSON parse failed" branch and then exhausted.
     assert any("Exhausted attempts. Last error: JSON parse failed" in m for m in logs)
+
+
+def test_httpx_is_loaded_on_demand():
+    import httpx
+
+    assert llm.httpx is httpx
+    assert llm._load_httpx() is httpx
+
+
+def test_http_client_reused_across_calls_and_closed(monkeypatch):
+    patch_logger(monkeypatch, [])
+    patch_sleep_and_random(monkeypatch)
+    ok = {"choices": [{"message": {"content": '{"a": 1}'}}]}
+
+    class ClosableClient(FakeHTTPXClient):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    fake = ClosableClient([FakeResponse(500), FakeResponse(json_data=ok), FakeResponse(json_data=ok)])
+    built = []
+    monkeypatch.setattr(llm.httpx, "Client", lambda timeout=None: built.append(timeout) or fake)
+
+    provider = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key=None)
+    c = llm.LLMClient(timeout_s=9, max_attempts=2)
+    msgs = [{"role": "user", "content": "hi"}]
+    assert c._call_chat_completions_json(provider, msgs) == {"a": 1}
+    assert c._call_chat_completions_json(provider, msgs) == {"a": 1}
+
+    assert built == [9.0]
+    assert len(fake.posts) == 3
+
+    c.close()
+    assert fake.closed is True
+    c.close()
+
+
+def test_share_http_clients_use_one_process_pool(monkeypatch):
+    patch_logger(monkeypatch, [])
+    monkeypatch.setattr(llm, "_SHARED_HTTP", {})
+    built = []
+    monkeypatch.setattr(llm.httpx, "Client", lambda timeout=None: built.append(timeout) or object())
+
+    a = llm.LLMClient(timeout_s=9, share_http=True)
+    b = llm.LLMClient(timeout_s=9, share_http=True)
+    slow = llm.LLMClient(timeout_s=120, share_http=True)
+    private = llm.LLMClient(timeout_s=9)
+
+    assert a._http_client("http://x/v1") is b._http_client("http://x/v1")
+    assert slow._http_client("http://x/v1") is not a._http_client("http://x/v1")
+    assert private._http_client("http://x/v1") is not a._http_client("http://x/v1")
+    assert built == [9.0, 120.0, 9.0]
+
+    a.close()  # detaches only; the pool stays usable for b
+    assert b._http_client("http://x/v1") is not None
+    assert len(built) == 3
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_request_and_response_codec(monkeypatch, use_orjson):
+    if use_orjson and llm.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(llm, "orjson", None)
+    patch_logger(monkeypatch, [])
+
+    class BytesResponse(FakeResponse):
+        content = _json.dumps({"choices": [{"message": {"content": '{"a": "é"}'}}]}).encode()
+
+    sent = {}
+
+    class Recorder(FakeHTTPXClient):
+        def post(self, url, headers=None, json=None, content=None):
+            sent.update(json=json, content=content)
+            return BytesResponse(json_data=_json.loads(BytesResponse.content))
+
+    patch_httpx_client(monkeypatch, Recorder([]))
+    provider = llm.LLMProvider(label="p", base_url="http://x/v1", model="m", api_key=None)
+    out = llm.LLMClient(max_attempts=1)._call_chat_completions_json(provider, [{"role": "user", "content": "hi"}])
+
+    assert out == {"a": "é"}
+    if use_orjson:
+        assert sent["json"] is None
+        assert _json.loads(sent["content"])["messages"] == [{"role": "user", "content": "hi"}]
+    else:
+        assert sent["content"] is None
+        assert sent["json"]["messages"] == [{"role": "user", "content": "hi"}]
+
+
+def test_provider_order_line_is_formatted_once_per_provider_set():
+    a = llm.LLMProvider(label="a", base_url="http://a/v1", model="m", api_key="k")
+    b = llm.LLMProvider(label="b", base_url="http://b/v1", model="n")
+    llm._provider_order_line.cache_clear()
+
+    line = llm._provider_order_line((a, b))
+    assert line == (
+        "[LLM] Provider order: a(model='m', base_url='http://a/v1', api_key=set), "
+        "b(model='n', base_url='http://b/v1', api_key=unset)"
+    )
+    assert llm._provider_order_line((a, b)) is line
+
+
+def test_no_temperature_models_frozen_from_any_iterable():
+    c = llm.LLMClient(no_temperature_models=["a", "b", "a"])
+    assert c.no_temperature_models == frozenset({"a", "b"})
+    assert isinstance(c.no_temperature_models, frozenset)
+    assert llm.LLMClient().no_temperature_models == {"gpt-5-mini"}
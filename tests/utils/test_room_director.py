@@ -60,6 +60,18 @@ def test_build_messages_uses_previous_generated_desc_preferentially_and_coerces_
     assert payload["memory"] == ""
 
 
+def test_build_messages_drops_repeated_facts_and_notable_flag():
+    snap = {
+        "room_key": "Room",
+        "facts": ["x", " y ", "x", "y"],
+        "objects": [{"key": "Lamp", "shortdesc": "a lamp", "desc": "", "notable": True}],
+    }
+    payload = json.loads(rd.build_messages(snap)[1]["content"])
+    assert payload["facts"] == ["x", "y"]
+    assert payload["objects"] == [{"key": "Lamp", "shortdesc": "a lamp", "desc": ""}]
+    assert snap["objects"][0]["notable"] is True  # snapshot itself is untouched
+
+
 def test_build_messages_falls_back_to_previous_desc_when_no_generated_desc():
     snap = {
         "room_key": "Room",
@@ -74,6 +86,12 @@ def test_build_messages_falls_back_to_previous_desc_when_no_generated_desc():
     assert payload["previous_desc"] == "OLD"
 
 
+def test_build_messages_uses_constant_prompt_and_compact_payload():
+    msgs = rd.build_messages({"room_key": "Room", "facts": ["x"]})
+    assert msgs[0]["content"] is rd.DIRECTOR_SYSTEM_PROMPT
+    assert msgs[1]["content"].startswith('{"room_key":"Room","previous_desc":""')
+
+
 def test_generate_from_snapshot_happy_path_filters_fact_strings(monkeypatch):
     # Patch logger import inside function
     class FakeLogger:
@@ -57,6 +57,17 @@ def test_iter_notable_props_filters_non_props(monkeypatch):
     assert got == [p1]
 
 
+def test_iter_notable_props_checks_notable_before_typeclass(monkeypatch):
+    checked = []
+    monkeypatch.setattr(roq, "inherits_from", lambda obj, path: checked.append(obj.key) or False)
+
+    lamp = FakeObj("Lamp", "#10", notable=True)
+    room = FakeRoom([lamp, FakeObj("Sofa", "#11"), FakeObj("Rug", "#12")])
+
+    assert list(roq.iter_notable_props(room)) == [lamp]
+    assert set(checked) == {"Lamp"}
+
+
 def test_list_notables_with_dbref_formats_and_limits(monkeypatch):
     patch_inherits_from(monkeypatch)
 
@@ -173,6 +184,19 @@ def test_delete_ambiguous_substring_returns_none(monkeypatch):
     assert lamp2.deleted is False
 
 
+def test_delete_exact_match_wins_after_ambiguous_substrings(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    lamp1 = FakeObj("Seafoam Brass Lamp", "#10")
+    lamp2 = FakeObj("Old Brass Lamp", "#11")
+    lamp3 = FakeObj("Brass Lamp", "#12")
+    room = FakeRoom([lamp1, lamp2, lamp3])
+
+    removed = roq.delete_object_by_selector(room, "brass lamp")
+    assert removed == {"key": "Brass Lamp", "dbref": "#12"}
+    assert (lamp1.deleted, lamp2.deleted, lamp3.deleted) == (False, False, True)
+
+
 # --- Tests for iter_props (generic prop iterator) ---
 
 def test_iter_props_yields_all_props(monkeypatch):
@@ -270,3 +294,82 @@ def test_iter_props_and_notable_empty_contents(monkeypatch):
     assert list(roq.iter_props(room)) == []
     assert list(roq.iter_notable_props(room)) == []
 
+
+
+def test_iter_props_uses_contents_cache_content_type(monkeypatch):
+    def no_inherits_from(obj, path):
+        raise AssertionError("typeclass walk should be skipped")
+
+    monkeypatch.setattr(roq, "inherits_from", no_inherits_from)
+
+    lamp = FakeObj("Lamp", "#10", notable=True)
+    sofa = FakeObj("Sofa", "#11", notable=False)
+
+    class CachedRoom(FakeRoom):
+        def contents_get(self, exclude=None, content_type=None):
+            assert content_type == "object"
+            return [lamp, sofa]
+
+    room = CachedRoom([lamp, sofa, FakeObj("North", "#12", kind="exit")])
+    assert list(roq.iter_props(room)) == [lamp, sofa]
+    assert list(roq.iter_notable_props(room)) == [lamp]
+
+
+def test_find_object_by_dbref_uses_idmapper_cache(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    class CachedRoom(FakeRoom):
+        cache = {}
+
+        def get_cached_instance(self, pk):
+            return self.cache.get(pk)
+
+    room = CachedRoom([])
+    elsewhere = CachedRoom([])
+    here = FakeObj("Lamp", "#5")
+    here.location = room
+    away = FakeObj("Rug", "#6")
+    away.location = elsewhere
+    CachedRoom.cache = {5: here, 6: away}
+
+    # contents is empty: a hit can only come from the cache
+    assert roq.find_object_by_dbref(room, "#5") is here
+    assert roq.find_object_by_dbref(room, "#6") is None
+    assert roq.find_object_in_room(room, "#5") is here
+
+
+def test_selectors_that_cannot_match_skip_the_contents_scan(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    class NoScanRoom:
+        @property
+        def contents(self):
+            raise AssertionError("contents should not be read")
+
+    room = NoScanRoom()
+    for sel in ("", "   ", None):
+        assert roq.find_object_in_room(room, sel) is None
+        assert roq.delete_object_by_selector(room, sel) is None
+    for dbref in ("", "10", "#", "#x1"):
+        assert roq.find_object_by_dbref(room, dbref) is None
+
+
+def test_inherits_from_is_memoized_per_class(monkeypatch):
+    seen = []
+
+    def fake_evennia_inherits_from(cls, path):
+        seen.append((cls, path))
+        return cls.__name__ == "Door"
+
+    monkeypatch.setattr(roq, "_evennia_inherits_from", fake_evennia_inherits_from)
+    roq._class_inherits.cache_clear()
+
+    class Door:
+        pass
+
+    class Rug:
+        pass
+
+    assert [roq.is_exit(o) for o in (Door(), Door(), Rug(), Rug())] == [True, True, False, False]
+    assert seen == [(Door, roq.EXIT_PATH), (Rug, roq.EXIT_PATH)]
+    roq._class_inherits.cache_clear()
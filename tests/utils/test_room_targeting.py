@@ -41,6 +41,21 @@ def test_words_min_length_and_alnum_only():
     assert rt._words("A an the 12 abc DEF ghi-jkl") == ["the", "abc", "def", "ghi", "jkl"]
 
 
+def test_words_fast_path_matches_regex_tokens():
+    for text in ("Brass_Lamp (old)!", "tab\tand\nnewline 99x", "Café Crème au lait", "😀 smile ok"):
+        expected = [w for w in rt._WORD_RE.findall(text.lower()) if len(w) >= 3]
+        assert rt._words(text) == expected
+
+
+def test_tokens_are_interned():
+    # build the strings at runtime so the compiler can't share the constants
+    a = rt._tokens("Brass " + "lamp".upper())
+    b = rt._tokens("".join(["br", "ass"]) + " la" + "mp")
+    assert a == b == ["brass", "lamp"]
+    assert all(x is y for x, y in zip(a, b))
+    assert rt._tokens("Café crème")[0] is rt._tokens("CAFÉ")[0]
+
+
 def test_resolve_edit_target_empty():
     room = FakeRoom([])
     assert rt.resolve_edit_target(room, "") == (None, [])
@@ -168,3 +183,57 @@ def test_instruction_mentions_target_ignores_stopwords_and_short_tokens():
     # stopwords like "change" should not count; "wood" (len 4) should.
     assert rt.instruction_mentions_target("change it", obj) is False
     assert rt.instruction_mentions_target("make it wood", obj) is True
+
+
+def test_object_tokens_cached_until_key_or_shortdesc_changes(monkeypatch):
+    obj = FakeObj("Brass Lamp", "#1", shortdesc="an old lantern")
+    obj.ndb = SimpleNamespace(target_tokens=None)
+    calls = []
+    real_words = rt._words
+    monkeypatch.setattr(rt, "_words", lambda s: calls.append(s) or real_words(s))
+
+    assert rt._object_tokens(obj) == {"brass", "lamp", "old", "lantern"}
+    assert rt._object_tokens(obj) == {"brass", "lamp", "old", "lantern"}
+    assert len(calls) == 2  # key + shortdesc, tokenized once
+
+    obj.db.shortdesc = "a red lantern"
+    assert rt._object_tokens(obj) == {"brass", "lamp", "red", "lantern"}
+    assert len(calls) == 4
+
+
+def test_resolve_edit_target_later_higher_score_replaces_earlier_ties(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    rug = FakeObj("Red Rug", "#1")
+    mug = FakeObj("Red Mug", "#2")
+    red_rug_lamp = FakeObj("Red Rug Lamp", "#3")
+    room = FakeRoom([rug, mug, red_rug_lamp])
+
+    assert rt.resolve_edit_target(room, "make the red thing blue") == (None, [rug, mug, red_rug_lamp])
+    assert rt.resolve_edit_target(room, "the red rug lamp, brighter") == (red_rug_lamp, [])
+    assert rt.resolve_edit_target(room, "...") == (None, [])
+
+
+def test_resolve_edit_target_tries_each_dbref_in_order(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    lamp = FakeObj("Lamp", "#10")
+    rug = FakeObj("Rug", "#11")
+    room = FakeRoom([lamp, rug])
+
+    assert rt.resolve_edit_target(room, "copy #99 onto #11, not #10") == (rug, [])
+    assert rt.resolve_edit_target(room, "#98 or #99") == (None, [])
+
+
+def test_resolve_edit_target_dbref_path_never_tokenizes(monkeypatch):
+    patch_inherits_from(monkeypatch)
+
+    def boom(_s):
+        raise AssertionError("dbref instructions must not be tokenized")
+
+    monkeypatch.setattr(rt, "_tokens", boom)
+    lamp = FakeObj("Lamp", "#10")
+    room = FakeRoom([lamp])
+
+    assert rt.resolve_edit_target(room, "make #10 glow") == (lamp, [])
+    assert rt.resolve_edit_target(room, "make #999 glow") == (None, [])
@@ -4,6 +4,8 @@ from utils.room_text import (
     is_computer_addressed,
     extract_computer_instruction,
     extract_dbref_anywhere,
+    split_computer_address,
+    may_be_computer_addressed,
 )
 
 
@@ -29,6 +31,9 @@ def test_is_computer_addressed_negative():
     assert is_computer_addressed("hey computer look") is False
     assert is_computer_addressed("compute something") is False
     assert is_computer_addressed("") is False
+    assert is_computer_addressed("computer") is False
+    assert is_computer_addressed("computerize it") is False
+    assert is_computer_addressed(None) is False
 
 
 def test_extract_computer_instruction_basic():
@@ -51,3 +56,31 @@ def test_extract_dbref_anywhere():
     assert extract_dbref_anywhere("change #67 to blue") == "#67"
     assert extract_dbref_anywhere("no ref here") is None
     assert extract_dbref_anywhere("") is None
+
+
+def test_extract_dbref_anywhere_skips_bare_hashes():
+    assert extract_dbref_anywhere("channel # one, then #42") == "#42"
+    assert extract_dbref_anywhere("just a # sign") is None
+    assert extract_dbref_anywhere(None) is None
+
+
+def test_split_computer_address():
+    assert split_computer_address("computer, open the doors") == "open the doors"
+    assert split_computer_address("Computer:") == ""
+    assert split_computer_address("hello there") is None
+    assert split_computer_address("") is None
+
+
+def test_may_be_computer_addressed_never_rejects_an_addressed_message():
+    for raw in (
+        "computer, open the doors",
+        ' "Computer: status" ',
+        "  ,:;computer do thing  ",
+        "\t'\"computer,go",
+        ",\u3000computer, hi",
+    ):
+        assert split_computer_address(normalize_say_message(raw)) is not None
+        assert may_be_computer_addressed(raw)
+    assert not may_be_computer_addressed("hello computer, how are you")
+    assert not may_be_computer_addressed("")
+    assert not may_be_computer_addressed(None)
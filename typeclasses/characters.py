@@ -29,9 +29,11 @@ class Character(ObjectParent, DefaultCharacter):
 
         # delegate to the room manager (if it exists)
         loc = self.location
-        if loc and hasattr(loc, "handle_speech"):
+        # one attribute lookup instead of hasattr() + a second fetch for the call
+        handle_speech = getattr(loc, "handle_speech", None) if loc else None
+        if handle_speech is not None:
             try:
-                loc.handle_speech(self, message, **kwargs)
+                handle_speech(self, message, **kwargs)
             except Exception:
                 logger.log_trace()
 
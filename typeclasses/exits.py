@@ -1,14 +1,19 @@
-from evennia import DefaultExit
+from types import MappingProxyType
+
+from evennia.objects.objects import DefaultExit
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.tags import AliasHandler
 from evennia.utils import create
+from evennia.utils.utils import lazy_property
 
-ALIASES = {
-    "north": ["n"],
-    "south": ["s"],
-    "east": ["e"],
-    "west": ["w"],
-    "up": ["u"],
-    "down": ["d"],
-}
+ALIASES = MappingProxyType({
+    "north": ("n",),
+    "south": ("s",),
+    "east": ("e",),
+    "west": ("w",),
+    "up": ("u",),
+    "down": ("d",),
+})
 
 DIRECTIONS = {
     "north": "south",
@@ -19,16 +24,134 @@ DIRECTIONS = {
     "down": "up",
 }
 
+
+def _aliases_by_exit(exits):
+    """
+    Fetch the aliases of all `exits` in a single query instead of one
+    aliases.all() per exit: {exit id: [lower alias, ...]}.
+    """
+    out = {ex.id: [] for ex in exits}
+    if out:
+        rows = ObjectDB.db_tags.through.objects.filter(
+            objectdb_id__in=list(out),
+            tag__db_model="objectdb",
+            tag__db_tagtype="alias",
+        ).values_list("objectdb_id", "tag__db_key")
+        for obj_id, alias in rows:
+            out[obj_id].append(str(alias).lower())
+    return out
+
+
+def exit_index(room):
+    """
+    Return (by_name, by_name_dest) lookups for the exits in `room`:
+      by_name:      {lower key or alias: exit}
+      by_name_dest: {(lower key, destination id): exit}
+    Built once per room and kept on room.ndb until an exit here changes.
+    """
+    index = room.ndb.exit_index
+    if index is None:
+        exits = room.exits
+        aliases = _aliases_by_exit(exits)
+        by_name = {}
+        by_name_dest = {}
+        for ex in exits:
+            key = (ex.key or "").lower()
+            by_name.setdefault(key, ex)
+            lower_aliases = frozenset(aliases[ex.id])
+            ex.ndb.lower_aliases = lower_aliases
+            for alias in lower_aliases:
+                by_name.setdefault(alias, ex)
+            by_name_dest.setdefault((key, ex.db_destination_id), ex)
+        index = (by_name, by_name_dest)
+        room.ndb.exit_index = index
+    return index
+
+
+def invalidate_exit_index(room):
+    """Drop the cached exit lookups for `room` (safe to call with None)."""
+    if room is not None:
+        room.ndb.exit_index = None
+
+
+class _ExitAliasHandler(AliasHandler):
+    """
+    AliasHandler that forgets the exit's cached alias lookups on every write
+    (add/remove/clear, and the batch_* forms that call them), so @alias and
+    direct aliases.add/remove can't leave them stale.
+    """
+    def _aliases_changed(self):
+        self.obj.ndb.lower_aliases = None
+        invalidate_exit_index(self.obj.location)
+
+    def add(self, *args, **kwargs):
+        result = super().add(*args, **kwargs)
+        self._aliases_changed()
+        return result
+
+    def remove(self, *args, **kwargs):
+        result = super().remove(*args, **kwargs)
+        self._aliases_changed()
+        return result
+
+    def clear(self, *args, **kwargs):
+        result = super().clear(*args, **kwargs)
+        self._aliases_changed()
+        return result
+
+
 class Exit(DefaultExit):
     """
     Default exit. Automatically adds direction aliases.
+    Keeps its location's exit index fresh when it is created, moved,
+    renamed, relinked, re-aliased or deleted.
     """
+    @lazy_property
+    def aliases(self):
+        return _ExitAliasHandler(self)
+
     def at_object_creation(self):
         super().at_object_creation()
         key = (self.key or "").lower().strip()
         aliases = ALIASES.get(key)
         if aliases:
-            self.aliases.add(*aliases)
+            # skip the tag write when they are already there (e.g. re-running creation)
+            existing = set(self.aliases.all())
+            missing = [a for a in aliases if a not in existing]
+            if missing:
+                self.aliases.add(*missing)
+        self.ndb.lower_aliases = None
+        invalidate_exit_index(self.location)
+
+    @property
+    def lower_aliases(self):
+        """Lowercased aliases as a frozenset, cached on ndb."""
+        value = self.ndb.lower_aliases
+        if value is None:
+            value = frozenset(a.lower() for a in self.aliases.all())
+            self.ndb.lower_aliases = value
+        return value
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Every destination write (`exit.destination = ...`, @link, or a raw
+        # db_destination change) ends in a save; a full save may include one.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "db_destination" in update_fields:
+            invalidate_exit_index(self.location)
+
+    def at_post_move(self, source_location, move_type="move", **kwargs):
+        super().at_post_move(source_location, move_type=move_type, **kwargs)
+        invalidate_exit_index(source_location)
+        invalidate_exit_index(self.location)
+
+    def at_rename(self, oldname, newname):
+        super().at_rename(oldname, newname)
+        invalidate_exit_index(self.location)
+
+    def at_object_delete(self):
+        invalidate_exit_index(self.location)
+        return super().at_object_delete()
 
 class SmartExit(Exit):
     """
@@ -8,11 +8,11 @@ import os
 import time
 import json
 import re
-from twisted.internet.threads import deferToThread
+from collections import deque
 
-from evennia import DefaultRoom, DefaultObject
+from django.db import transaction
+from evennia.objects.objects import DefaultRoom, DefaultObject
 from evennia.utils import create, logger
-from evennia.utils.utils import inherits_from
 from evennia.utils.utils import delay
 
 from utils.llm_client import (
@@ -27,12 +27,35 @@ from utils.room_object_query import (
     find_object_in_room,
     delete_object_by_selector,
     is_prop,
+    is_exit,
+    is_character,
 )
 from utils.room_targeting import resolve_edit_target, instruction_mentions_target
-from utils.room_text import normalize_say_message, is_computer_addressed, extract_computer_instruction
+from utils.room_text import (
+    normalize_say_message,
+    may_be_computer_addressed,
+    split_computer_address,
+)
+from utils.facts import new_fact, add_fact, get_facts, remove_fact
 from utils.image_mixin import ImageMixin
 from utils.object_classification import apply_classification
 
+# Speech-command patterns, compiled once instead of per say event.
+_UNPIN_RE = re.compile(r"^unpin\s+([a-zA-Z0-9_]+)$", re.IGNORECASE)
+_PIN_RE = re.compile(r"^pin\s+(.+)$", re.IGNORECASE)
+_TO_SPLIT_RE = re.compile(r"\s+to\s+", re.IGNORECASE)
+_DESTROY_RE = re.compile(r"^(destroy|delete|remove)\b(.*)$")  # matched against lowinst
+_VERB_RE = re.compile(r"\w+")  # first word of lowinst, same boundary as the \b above
+_CREATE_VERB_RE = re.compile(r"^(create|make|manifest|summon)\s+", re.IGNORECASE)
+_ARTICLE_RE = re.compile(r"^(the|a|an)\s+", re.IGNORECASE)
+_LETTER_RE = re.compile(r"[A-Za-z]")
+
+
+def _collapse_ws(text):
+    """Collapse whitespace runs to one space and strip the ends, in C (no regex)."""
+    # str.split() and re's \s agree on what counts as whitespace in str
+    return " ".join(text.split())
+
 
 class Room(DefaultRoom):
     """
@@ -54,12 +77,14 @@ class SmartRoom(ImageMixin, DefaultRoom):
     # Disable image gen for rooms that don't want it
     image_enabled = True
     MEMORY_MAX = 50                 # remember last N lines of speech
+    MEMORY_SAVE_EVERY = 10          # persist the speech buffer every N lines
     LLM_COOLDOWN_SECONDS = 2.0      # minimum time between LLM calls per room
     LLM_MAX_ATTEMPTS = 4            # total attempts per request (per provider)
 
     # Room rewrite controls
     DESC_UPDATE_DEBOUNCE_S = 1.0
     DESC_UPDATE_COOLDOWN_S = 3.0
+    DIRECTOR_FACTS_MAX = 32         # keep at most N director facts per rewrite
 
     # Local first (LM Studio OpenAI-compatible server)
     LOCAL_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:1234/v1")
@@ -72,6 +97,15 @@ class SmartRoom(ImageMixin, DefaultRoom):
 
     LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "180"))
 
+    # "computer, <verb> ..." -> handler method name; see handle_speech
+    _SPEECH_VERBS = {
+        "unpin": "_speech_unpin",
+        "pin": "_speech_pin",
+        **dict.fromkeys(("destroy", "delete", "remove"), "_speech_destroy"),
+        **dict.fromkeys(("edit", "update", "change", "recolor", "paint"), "_speech_edit"),
+        **dict.fromkeys(("create", "make", "manifest", "summon"), "_speech_create"),
+    }
+
     # ----------------------------
     # Init
     # ----------------------------
@@ -86,29 +120,62 @@ class SmartRoom(ImageMixin, DefaultRoom):
             self.db.last_generated_desc = self.db.desc
         if self.db.memory is None:
             self.db.memory = []
-        if self.db.last_llm_call_ts is None:
-            self.db.last_llm_call_ts = 0.0
-        if self.db.last_desc_rewrite_ts is None:
-            self.db.last_desc_rewrite_ts = 0.0
 
     # ----------------------------
     # Memory
     # ----------------------------
 
+    def _memory_buffer(self):
+        """
+        The live rolling speech buffer: a deque(maxlen=MEMORY_MAX) on ndb,
+        seeded from db.memory the first time it's needed after a (re)load.
+        """
+        buf = self.ndb.memory
+        if buf is None:
+            buf = deque(self.db.memory or (), maxlen=self.MEMORY_MAX)
+            self.ndb.memory = buf
+            self.ndb.memory_unsaved = 0
+        return buf
+
+    def _save_memory(self):
+        """Write the live speech buffer back to db.memory."""
+        buf = self.ndb.memory
+        if buf is not None and self.ndb.memory_unsaved:
+            self.db.memory = list(buf)
+            self.ndb.memory_unsaved = 0
+
     def _remember(self, speaker, message):
         """
         Store a rolling buffer of recent speech in the room.
+        Appends go to the in-memory deque (eviction is free); db.memory is
+        rewritten every MEMORY_SAVE_EVERY lines, on reload/shutdown and when
+        the idmapper drops the room, instead of on every line.
         """
-        mem = self.db.memory or []
-        mem.append({"who": speaker.key, "msg": str(message)})
-        self.db.memory = mem[-self.MEMORY_MAX:]
+        self._memory_buffer().append({"who": str(speaker.key), "msg": str(message)})
+        self.ndb.memory_unsaved += 1
+        if self.ndb.memory_unsaved >= self.MEMORY_SAVE_EVERY:
+            self._save_memory()
 
     def get_memory_text(self):
         """
         Human-readable memory for debugging or feeding into an LLM later.
         """
-        mem = self.db.memory or []
-        return "\n".join(f'{m["who"]}: {m["msg"]}' for m in mem)
+        # entries are stored as strings (see _remember), so plain concatenation
+        # is enough; join is given a list so it can size the result up front
+        return "\n".join([m["who"] + ": " + m["msg"] for m in self._memory_buffer()])
+
+    def at_server_reload(self):
+        self._save_memory()
+        super().at_server_reload()
+
+    def at_server_shutdown(self):
+        self._save_memory()
+        super().at_server_shutdown()
+
+    def at_idmapper_flush(self):
+        # the deque lives in ndb and goes away with the cached instance
+        self._save_memory()
+        return super().at_idmapper_flush()
 
     # ----------------------------
     # Auto room description rewrites (director)
@@ -138,44 +205,42 @@ class SmartRoom(ImageMixin, DefaultRoom):
         Strict by default: only notable props influence room rewrites.
         Change to `return True` if you want *all* non-exit/non-character objects.
         """
-        if not obj:
-            return False
-        if inherits_from(obj, "evennia.objects.objects.DefaultExit"):
+        if not obj or not obj.db.notable:
             return False
-        if inherits_from(obj, "evennia.objects.objects.DefaultCharacter"):
-            return False
-        return bool(obj.db.notable)
+        return not is_exit(obj) and not is_character(obj)
 
     def at_object_receive(self, moved_obj, source_location, **kwargs):
         super().at_object_receive(moved_obj, source_location, **kwargs)
         is_notable = self._is_scene_object(moved_obj)
+        auto_desc = self.db.auto_desc
         logger.log_info(
             f"[SmartRoom #{self.id}] at_object_receive: {moved_obj.key} (dbref={moved_obj.dbref}), "
-            f"notable={is_notable}, auto_desc={self.db.auto_desc}"
+            f"notable={is_notable}, auto_desc={auto_desc}"
         )
-        if self.db.auto_desc and is_notable:
+        if auto_desc and is_notable:
             self._schedule_desc_rewrite()
 
     def at_object_leave(self, moved_obj, destination, **kwargs):
         super().at_object_leave(moved_obj, destination, **kwargs)
         is_notable = self._is_scene_object(moved_obj)
+        auto_desc = self.db.auto_desc
         logger.log_info(
             f"[SmartRoom #{self.id}] at_object_leave: {moved_obj.key} (dbref={moved_obj.dbref}), "
-            f"notable={is_notable}, auto_desc={self.db.auto_desc}"
+            f"notable={is_notable}, auto_desc={auto_desc}"
         )
-        if self.db.auto_desc and is_notable:
+        if auto_desc and is_notable:
             self._schedule_desc_rewrite()
 
     def _schedule_desc_rewrite(self):
         """
         Coalesce bursts of changes into one LLM call.
+        A change while a rewrite is already scheduled needs nothing more: the
+        rewrite snapshots the room when it fires, so it picks the change up.
+        Changes during an in-flight rewrite are queued by _start_desc_rewrite.
         """
-        task = getattr(self.ndb, "desc_rewrite_task", None)
-        if task:
-            try:
-                task.cancel()
-            except Exception:
-                pass
+        task = self.ndb.desc_rewrite_task
+        if task is not None and task.active():
+            return
         self.ndb.desc_rewrite_task = delay(self.DESC_UPDATE_DEBOUNCE_S, self._start_desc_rewrite)
 
     def _start_desc_rewrite(self):
@@ -185,15 +250,17 @@ class SmartRoom(ImageMixin, DefaultRoom):
             return
         self.ndb.desc_rewrite_inflight = True
 
-        now = time.time()
-        last = float(self.db.last_desc_rewrite_ts or 0.0)
-        if now - last < self.DESC_UPDATE_COOLDOWN_S:
+        # cooldown stamps live on ndb with a monotonic clock: no Attribute
+        # round trip per event, and wall-clock jumps can't stretch or skip them
+        now = time.monotonic()
+        last = self.ndb.last_desc_rewrite_ts
+        if last is not None and now - last < self.DESC_UPDATE_COOLDOWN_S:
             # Don't drop rewrites; retry after remaining cooldown.
             remaining = (self.DESC_UPDATE_COOLDOWN_S - (now - last)) + 0.05
             self.ndb.desc_rewrite_inflight = False
             delay(remaining, self._start_desc_rewrite)
             return
-        self.db.last_desc_rewrite_ts = now
+        self.ndb.last_desc_rewrite_ts = now
 
         # NEW: subtle “thinking” cue
         # Safety net: if the LLM call hangs, unlock the inflight flag after 125s
@@ -202,9 +269,9 @@ class SmartRoom(ImageMixin, DefaultRoom):
         self.ndb.safe_unlock_handle = delay(125.0, self._unlock_desc_rewrite)
 
         self.msg_contents("|mThe set shimmers, reconsidering itself…|n")
-        computer = Computer(self)
+        computer = self._computer()
         snapshot = computer.director_snapshot()
-        d = deferToThread(computer.generate_room_desc_safe, snapshot)
+        d = computer.generate_room_desc_deferred(snapshot)
 
         def _on_ok(data):
             try:
@@ -217,9 +284,15 @@ class SmartRoom(ImageMixin, DefaultRoom):
 
                 if new_desc and new_desc != (self.db.desc or ""):
                     self.db.desc = new_desc
-                    self.db.last_generated_desc = new_desc
+                    # every Attribute set pickles and commits, even for an
+                    # equal value: only write what actually changed
+                    if self.db.last_generated_desc != new_desc:
+                        self.db.last_generated_desc = new_desc
                     if isinstance(facts, list):
-                        self.db.director_facts = facts
+                        facts = facts[:self.DIRECTOR_FACTS_MAX]
+                        # a stored _SaverList compares equal to a plain list
+                        if self.db.director_facts != facts:
+                            self.db.director_facts = facts
 
                     self.msg_contents("|mReality settles into a new arrangement.|n")
                     # Trigger room image generation on description rewrite
@@ -270,310 +343,323 @@ class SmartRoom(ImageMixin, DefaultRoom):
         if not message:
             return
 
-        from utils.facts import new_fact, add_fact, get_facts, remove_fact
-
         # Remember ALL speech
         self._remember(speaker, message)
 
         msg = str(message).strip()
         if not msg:
             return
+        # most speech is plain chat: screen it out before normalizing
+        if not may_be_computer_addressed(msg):
+            return
 
         # normalize quotes/punctuation
         norm = normalize_say_message(msg)
-        if not is_computer_addressed(norm):
+        instruction = split_computer_address(norm)
+        if instruction is None:
             return
-        instruction = extract_computer_instruction(norm)
 
         if not instruction:
             speaker.msg("Try: say computer, create a brass cat idol")
             return
-        lowinst = instruction.strip().lower()
+        # split_computer_address already stripped it; lower it once for every branch
+        lowinst = instruction.lower()
 
         # ---- LIST FACTS ----
         if lowinst in ("facts", "list facts", "show facts"):
-            lines = []
-            # room facts
-            rf = get_facts(self)
-            if rf:
-                lines.append("|wRoom facts:|n")
-                for f in rf[-15:]:
-                    lines.append(f"  {f.get('id')}: {f.get('text')}")
-            # object facts (notable only)
-            for obj in self.contents:
-                if not obj or not obj.db.notable:
-                    continue
-                of = get_facts(obj)
-                if of:
-                    lines.append(f"|w{obj.key} facts:|n")
-                    for f in of[-10:]:
-                        lines.append(f"  {f.get('id')}: {f.get('text')}")
-            if not lines:
-                speaker.msg("No pinned facts yet. Try: |wsay computer, pin This is a seaside lounge.|n")
-            else:
-                speaker.msg("\n".join(lines))
+            self._speech_list_facts(speaker)
             return
 
-        # ---- UNPIN (room only, for now) ----
-        m = re.match(r"^unpin\s+([a-zA-Z0-9_]+)$", instruction.strip(), flags=re.IGNORECASE)
-        if m:
-            fid = m.group(1)
-            ok = remove_fact(self, fid)
-            if ok:
-                self.msg_contents(f"|mThe room nods.|n Unpinned {fid}.")
-                self._schedule_desc_rewrite()
-            else:
-                speaker.msg(f"I can't find a room fact with id '{fid}'. Try: |wsay computer, facts|n")
+        # one dict lookup on the first word picks the command; a handler
+        # returning False (e.g. "pin" with nothing after it) falls through
+        # to the intent router like an unknown verb does
+        m = _VERB_RE.match(lowinst)
+        verb = m.group(0) if m else ""
+        handler = self._SPEECH_VERBS.get(verb)
+        if handler and getattr(self, handler)(speaker, instruction, verb):
             return
 
-        # ---- PIN: "pin <text>" or "pin <text> to <target>" ----
-        m = re.match(r"^pin\s+(.+)$", instruction.strip(), flags=re.IGNORECASE)
-        if m:
-            rest = m.group(1).strip()
-
-            # Split on " to " if present
-            fact_text = rest
-            target_text = None
-            if " to " in rest.lower():
-                # case-insensitive split preserving original
-                parts = re.split(r"\s+to\s+", rest, maxsplit=1, flags=re.IGNORECASE)
-                fact_text = parts[0].strip()
-                target_text = parts[1].strip() if len(parts) > 1 else None
-
-            if not fact_text:
-                speaker.msg("Try: |wsay computer, pin This is a seaside lounge.|n")
-                return
+        # --- Fallback intent router (LLM) with confirmation ---
+        self._speech_route_intent(speaker, instruction)
 
-            # Choose target
-            target_obj = self  # default: room
-            if target_text:
-                found = find_object_in_room(self, target_text)
-                if not found:
-                    speaker.msg(f"I couldn't find '{target_text}' to pin that to.")
-                    return
-                target_obj = found
+    def _llm_call_allowed(self, speaker):
+        """
+        Per-room LLM cooldown: stamp the call time and return True, or tell
+        the speaker to wait and return False.
+        """
+        now = time.monotonic()
+        last = self.ndb.last_llm_call_ts
+        if last is not None and now - last < self.LLM_COOLDOWN_SECONDS:
+            speaker.msg("|yThe room holds up a paw.|n Give it a second…")
+            return False
+        self.ndb.last_llm_call_ts = now
+        return True
+
+    def _speech_list_facts(self, speaker):
+        lines = []
+        # room facts
+        rf = get_facts(self)
+        if rf:
+            lines.append("|wRoom facts:|n")
+            for f in rf[-15:]:
+                lines.append(f"  {f.get('id')}: {f.get('text')}")
+        # object facts (notable only)
+        for obj in self.contents:
+            if not obj or not obj.db.notable:
+                continue
+            of = get_facts(obj)
+            if of:
+                lines.append(f"|w{obj.key} facts:|n")
+                for f in of[-10:]:
+                    lines.append(f"  {f.get('id')}: {f.get('text')}")
+        if not lines:
+            speaker.msg("No pinned facts yet. Try: |wsay computer, pin This is a seaside lounge.|n")
+        else:
+            speaker.msg("\n".join(lines))
 
-            f = new_fact(fact_text, created_by=speaker.key, scope="pinned", strength=1.0)
-            add_fact(target_obj, f)
-            self.msg_contents(f"|mThe room remembers.|n Pinned: “{fact_text}”")
+    def _speech_unpin(self, speaker, instruction, verb):
+        """UNPIN (room only, for now)."""
+        m = _UNPIN_RE.match(instruction)
+        if not m:
+            return False
+        fid = m.group(1)
+        ok = remove_fact(self, fid)
+        if ok:
+            self.msg_contents(f"|mThe room nods.|n Unpinned {fid}.")
             self._schedule_desc_rewrite()
-            return
-
-        m = re.match(r"^(destroy|delete|remove)\b(.*)$", lowinst)
-        if m:
-            remainder = instruction.strip()[len(m.group(1)):].strip()  # keep original casing
-            # strip leading articles
-            remainder = re.sub(r"^(the|a|an)\s+", "", remainder, flags=re.IGNORECASE).strip()
-
-            if not remainder:
-                speaker.msg("Tell me what to destroy, e.g. |wsay computer, destroy Thorned Yuletide Sentinel|n")
-                return
+        else:
+            speaker.msg(f"I can't find a room fact with id '{fid}'. Try: |wsay computer, facts|n")
+        return True
 
-            removed = delete_object_by_selector(self, remainder)
-            if not removed:
-                opts = list_notables_with_dbref(self)
-                if opts:
-                    speaker.msg("|yIn this room I can remove:|n " + opts)
-            if removed:
-                self.msg_contents(f"|mThe room complies.|n {removed['key']}({removed['dbref']}) is removed.")
-                self._schedule_desc_rewrite()
+    def _speech_pin(self, speaker, instruction, verb):
+        """PIN: "pin <text>" or "pin <text> to <target>"."""
+        m = _PIN_RE.match(instruction)
+        if not m:
+            return False
+        rest = m.group(1).strip()
+
+        # Split on " to " if present
+        fact_text = rest
+        target_text = None
+        if " to " in rest.lower():
+            # case-insensitive split preserving original
+            parts = _TO_SPLIT_RE.split(rest, maxsplit=1)
+            fact_text = parts[0].strip()
+            target_text = parts[1].strip() if len(parts) > 1 else None
+
+        if not fact_text:
+            speaker.msg("Try: |wsay computer, pin This is a seaside lounge.|n")
+            return True
+
+        # Choose target
+        target_obj = self  # default: room
+        if target_text:
+            found = find_object_in_room(self, target_text)
+            if not found:
+                speaker.msg(f"I couldn't find '{target_text}' to pin that to.")
+                return True
+            target_obj = found
+
+        f = new_fact(fact_text, created_by=speaker.key, scope="pinned", strength=1.0)
+        add_fact(target_obj, f)
+        self.msg_contents(f"|mThe room remembers.|n Pinned: “{fact_text}”")
+        self._schedule_desc_rewrite()
+        return True
+
+    def _speech_destroy(self, speaker, instruction, verb):
+        remainder = instruction[len(verb):].strip()  # keep original casing
+        # strip leading articles
+        remainder = _ARTICLE_RE.sub("", remainder).strip()
+
+        if not remainder:
+            speaker.msg("Tell me what to destroy, e.g. |wsay computer, destroy Thorned Yuletide Sentinel|n")
+            return True
+
+        removed = delete_object_by_selector(self, remainder)
+        if not removed:
+            opts = list_notables_with_dbref(self)
+            if opts:
+                speaker.msg("|yIn this room I can remove:|n " + opts)
+        if removed:
+            self.msg_contents(f"|mThe room complies.|n {removed['key']}({removed['dbref']}) is removed.")
+            self._schedule_desc_rewrite()
+        else:
+            speaker.msg(f"|yI couldn't find|n '{remainder}'. Try the exact name, or copy a dbref from the list above (example format: |w#67|n).")
+        return True
+
+    def _speech_edit(self, speaker, instruction, verb):
+        if not self._llm_call_allowed(speaker):
+            return True
+
+        target, ambiguous = resolve_edit_target(self, instruction)
+
+        if target and not instruction_mentions_target(instruction, target):
+            # The resolver guessed a target that the instruction doesn't even name.
+            # Treat as ambiguous and force dbref.
+            target = None
+            ambiguous = []
+
+        if not target:
+            opts = list_notables_with_dbref(self)
+            if ambiguous:
+                amb = ", ".join(f"{o.key}({o.dbref})" for o in ambiguous[:12])
+                speaker.msg("|yWhich one did you mean?|n Use a dbref, e.g. |wsay computer, change #67 to be blue|n\n"
+                            f"I see: {amb}")
             else:
-                speaker.msg(f"|yI couldn't find|n '{remainder}'. Try the exact name, or copy a dbref from the list above (example format: |w#67|n).")
-            return
-
-        # --- EDITING ---
-        m = re.match(r"^(edit|update|change|recolor|paint)\b(.*)$", lowinst)
-        if m:
-            now = time.time()
-            last = float(self.db.last_llm_call_ts or 0.0)
-            if now - last < self.LLM_COOLDOWN_SECONDS:
-                speaker.msg("|yThe room holds up a paw.|n Give it a second…")
-                return
-            self.db.last_llm_call_ts = now
-
-
-            target, ambiguous = resolve_edit_target(self, instruction)
-            
-            if target and not instruction_mentions_target(instruction, target):
-                # The resolver guessed a target that the instruction doesn't even name.
-                # Treat as ambiguous and force dbref.
-                target = None
-                ambiguous = []
-
-            if not target:
-                opts = list_notables_with_dbref(self)
-                if ambiguous:
-                    amb = ", ".join(f"{o.key}({o.dbref})" for o in ambiguous[:12])
-                    speaker.msg("|yWhich one did you mean?|n Use a dbref, e.g. |wsay computer, change #67 to be blue|n\n"
-                                f"I see: {amb}")
+                if opts:
+                    speaker.msg("I couldn't tell what object you meant. Use a dbref like |w#67|n.\n"
+                                f"I see: {opts}")
                 else:
-                    if opts:
-                        speaker.msg("I couldn't tell what object you meant. Use a dbref like |w#67|n.\n"
-                                    f"I see: {opts}")
-                    else:
-                        speaker.msg("I couldn't tell what object you meant. Try including its name or a dbref like |w#67|n.")
-                return
+                    speaker.msg("I couldn't tell what object you meant. Try including its name or a dbref like |w#67|n.")
+            return True
 
-            self.msg_contents("|mThe room studies the object, considering your request…|n")
+        self.msg_contents("|mThe room studies the object, considering your request…|n")
 
-            computer = Computer(self)
-            d = deferToThread(computer.generate_prop_edit_json, speaker.key, instruction, str(target.dbref))
+        computer = self._computer()
+        d = computer.generate_prop_edit_json_deferred(speaker.key, instruction, str(target.dbref))
 
-            def _on_ok(data):
-                if not isinstance(data, dict):
-                    raise ValueError(f"Editor returned non-dict: {data!r}")
-
-                # Hard guard: model must confirm which object it edited.
-                resp_dbref = str(data.get("dbref") or "").strip()
-                if resp_dbref and resp_dbref != str(target.dbref):
-                    raise ValueError(f"Editor dbref mismatch: got {resp_dbref}, expected {target.dbref}")
-
-                new_key = str(data.get("key") or "").strip()
-                new_sd = str(data.get("shortdesc") or "").strip()
-                new_desc = str(data.get("desc") or "").strip()
-
-                # --- Apply key (object name) ---
-                if new_key:
-                    new_key = re.sub(r"\s+", " ", new_key).strip()
-                    new_key = new_key[:60].strip()
-
-                    # Must contain at least one letter (avoid pure punctuation / empty)
-                    if re.search(r"[A-Za-z]", new_key) and new_key != target.key:
-                        target.key = new_key
-
-                # --- Apply shortdesc ---
-                if new_sd:
-                    new_sd = re.sub(r"\s+", " ", new_sd).strip()
-                    # (Optional) enforce article rule only if you want it; otherwise remove this block.
-                    # if not re.match(r"^(a|an|the)\b", new_sd, re.IGNORECASE):
-                    #     new_sd = "a " + new_sd
-                    target.db.shortdesc = new_sd[:140]
-
-                # --- Apply desc ---
-                if new_desc:
-                    new_desc = new_desc.strip()
-                    target.db.desc = new_desc
-
-                # Trigger a fresh object image after the edit — the old image is likely stale.
-                if self.image_enabled and self._can_trigger_image():
-                    self._trigger_object_image(target)
-
-                self.msg_contents(
-                    f"|mReality tweaks itself.|n {target.key} now looks a little different."
-                )
-                self._schedule_desc_rewrite()
+        def _on_ok(data):
+            if not isinstance(data, dict):
+                raise ValueError(f"Editor returned non-dict: {data!r}")
+
+            # Hard guard: model must confirm which object it edited.
+            resp_dbref = str(data.get("dbref") or "").strip()
+            if resp_dbref and resp_dbref != str(target.dbref):
+                raise ValueError(f"Editor dbref mismatch: got {resp_dbref}, expected {target.dbref}")
+
+            new_key = str(data.get("key") or "").strip()
+            new_sd = str(data.get("shortdesc") or "").strip()
+            new_desc = str(data.get("desc") or "").strip()
+
+            # --- Apply key (object name) ---
+            if new_key:
+                new_key = _collapse_ws(new_key)[:60].rstrip()
+
+                # Must contain at least one letter (avoid pure punctuation / empty)
+                if _LETTER_RE.search(new_key) and new_key != target.key:
+                    target.key = new_key
+
+            # --- Apply shortdesc ---
+            if new_sd:
+                new_sd = _collapse_ws(new_sd)
+                # (Optional) enforce article rule only if you want it; otherwise remove this block.
+                # if not re.match(r"^(a|an|the)\b", new_sd, re.IGNORECASE):
+                #     new_sd = "a " + new_sd
+                target.db.shortdesc = new_sd[:140]
+
+            # --- Apply desc ---
+            if new_desc:
+                new_desc = new_desc.strip()
+                target.db.desc = new_desc
+
+            # Trigger a fresh object image after the edit — the old image is likely stale.
+            if self.image_enabled and self._can_trigger_image():
+                self._trigger_object_image(target)
+
+            self.msg_contents(
+                f"|mReality tweaks itself.|n {target.key} now looks a little different."
+            )
+            self._schedule_desc_rewrite()
 
-            def _on_fail(failure):
-                logger.log_err(f"[SmartRoom] edit failure:\n{failure.getTraceback()}")
-                self.msg_contents("|rThe room hesitates.|n The edit doesn't take. (Try again.)")
-                return None
+        def _on_fail(failure):
+            logger.log_err(f"[SmartRoom] edit failure:\n{failure.getTraceback()}")
+            self.msg_contents("|rThe room hesitates.|n The edit doesn't take. (Try again.)")
+            return None
 
-            d.addCallback(_on_ok)
-            d.addErrback(_on_fail)
-            return
+        d.addCallback(_on_ok)
+        d.addErrback(_on_fail)
+        return True
 
+    def _speech_create(self, speaker, instruction, verb):
+        """Explicit create/make/summon commands."""
+        # normalize into an instruction for the prop-writer (strip the verb)
+        remainder = _CREATE_VERB_RE.sub("", instruction).strip()
+        if not remainder:
+            speaker.msg("Try: say computer, create a brass cat idol")
+            return True
 
-        # --- Explicit create/make/summon commands ---
-        if re.match(r"^(create|make|manifest|summon)\b", lowinst):
-            # normalize into an instruction for the prop-writer (strip the verb)
-            remainder = re.sub(r"^(create|make|manifest|summon)\s+", "", instruction, flags=re.IGNORECASE).strip()
-            if not remainder:
-                speaker.msg("Try: say computer, create a brass cat idol")
-                return
+        if not self._llm_call_allowed(speaker):
+            return True
 
-            now = time.time()
-            last = float(self.db.last_llm_call_ts or 0.0)
-            if now - last < self.LLM_COOLDOWN_SECONDS:
-                speaker.msg("|yThe room holds up a paw.|n Give it a second…")
-                return
-            self.db.last_llm_call_ts = now
+        self.msg_contents("|mThe room listens.|n Something begins to take shape…")
 
-            self.msg_contents("|mThe room listens.|n Something begins to take shape…")
+        computer = self._computer()
+        d = computer.generate_prop_json_deferred(speaker.key, remainder)
 
-            computer = Computer(self)
-            d = deferToThread(computer.generate_prop_json, speaker.key, remainder)
+        def _on_ok(propdata):
+            if not isinstance(propdata, dict):
+                raise ValueError(f"LLM returned non-dict: {propdata!r}")
 
-            def _on_ok(propdata):
-                if not isinstance(propdata, dict):
-                    raise ValueError(f"LLM returned non-dict: {propdata!r}")
+            key = str(propdata.get("key") or "").strip()
+            shortdesc = str(propdata.get("shortdesc") or "").strip()
 
-                key = str(propdata.get("key") or "").strip()
-                shortdesc = str(propdata.get("shortdesc") or "").strip()
+            desc = (propdata.get("desc") or propdata.get("description") or "").strip()
 
-                desc = (propdata.get("desc") or propdata.get("description") or "").strip()
+            # All fields empty — skip the object and just acknowledge
+            if not key and not shortdesc and not desc:
+                self.msg_contents(f"|mThe room hums.|n {remainder.strip().title()} has been noted.")
+                return
 
-                # All fields empty — skip the object and just acknowledge
-                if not key and not shortdesc and not desc:
-                    self.msg_contents(f"|mThe room hums.|n {remainder.strip().title()} has been noted.")
-                    return
+            # If LLM didn't give a proper description, build a minimal one
+            if not desc:
+                desc = f"A newly manifested {remainder.strip()}."
 
-                # If LLM didn't give a proper description, build a minimal one
-                if not desc:
-                    desc = f"A newly manifested {remainder.strip()}."
+            obj = self._manifest_prop(key=key[:60], shortdesc=shortdesc[:140], desc=desc)
+            # Apply object classification so abilities are discoverable
+            apply_classification(obj, propdata.get("object_type"), propdata.get("properties"))
+            self.msg_contents(f"|mThe room hums.|n {obj.db.shortdesc or obj.key} appears at {speaker.key}'s request.")
+            self._schedule_desc_rewrite()
 
-                obj = self._manifest_prop(key=key[:60], shortdesc=shortdesc[:140], desc=desc)
-                # Apply object classification so abilities are discoverable
-                apply_classification(obj, propdata.get("object_type"), propdata.get("properties"))
-                self.msg_contents(f"|mThe room hums.|n {obj.db.shortdesc or obj.key} appears at {speaker.key}'s request.")
-                self._schedule_desc_rewrite()
+        def _on_fail(failure):
+            logger.log_err(f"[SmartRoom] LLM/manifestation failure:\n{failure.getTraceback()}")
+            self.msg_contents("|rThe room sputters.|n The manifestation fails. (Try again in a moment.)")
+            return None
 
-            def _on_fail(failure):
-                logger.log_err(f"[SmartRoom] LLM/manifestation failure:\n{failure.getTraceback()}")
-                self.msg_contents("|rThe room sputters.|n The manifestation fails. (Try again in a moment.)")
-                return None
+        d.addCallback(_on_ok)
+        d.addErrback(_on_fail)
+        return True
 
-            d.addCallback(_on_ok)
-            d.addErrback(_on_fail)
+    def _speech_route_intent(self, speaker, instruction):
+        if not self._llm_call_allowed(speaker):
             return
 
-        
-        else:
-            # --- Fallback intent router (LLM) with confirmation ---
-            now = time.time()
-            last = float(self.db.last_llm_call_ts or 0.0)
-            if now - last < self.LLM_COOLDOWN_SECONDS:
-                speaker.msg("|yThe room holds up a paw.|n Give it a second…")
-                return
-            self.db.last_llm_call_ts = now
+        self.msg_contents("|mThe room tilts its head, interpreting…|n")
 
-            self.msg_contents("|mThe room tilts its head, interpreting…|n")
+        computer = self._computer()
+        d = computer.predict_intent_deferred(speaker.key, instruction)
 
-            computer = Computer(self)
-            d = deferToThread(computer.predict_intent, speaker.key, instruction)
+        def _ok(data):
+            if not isinstance(data, dict):
+                raise ValueError(f"Intent router returned non-dict: {data!r}")
 
-            def _ok(data):
-                if not isinstance(data, dict):
-                    raise ValueError(f"Intent router returned non-dict: {data!r}")
-
-                intent = str(data.get("intent") or "unknown").strip().lower()
-                normalized = str(data.get("normalized") or "").strip()
-
-                # If the router couldn't produce a concrete command, give a short help nudge.
-                if not normalized or intent == "unknown":
-                    speaker.msg(
-                        "I’m not sure what you meant. Try one of:\n"
-                        "  |wsay computer, create <thing>|n\n"
-                        "  |wsay computer, destroy <thing>|n\n"
-                        "  |wsay computer, pin <fact>|n\n"
-                        "  |wsay computer, facts|n"
-                    )
-                    return
+            intent = str(data.get("intent") or "unknown").strip().lower()
+            normalized = str(data.get("normalized") or "").strip()
 
-                # Suggest-only: no pending state, no y/n.
+            # If the router couldn't produce a concrete command, give a short help nudge.
+            if not normalized or intent == "unknown":
                 speaker.msg(
-                    "I can’t run that as-written, but I think you meant:\n"
-                    f"  |wsay computer, {normalized}|n\n"
-                    "(Copy/paste that line.)"
+                    "I’m not sure what you meant. Try one of:\n"
+                    "  |wsay computer, create <thing>|n\n"
+                    "  |wsay computer, destroy <thing>|n\n"
+                    "  |wsay computer, pin <fact>|n\n"
+                    "  |wsay computer, facts|n"
                 )
+                return
 
-            def _fail(failure):
-                logger.log_err(f"[SmartRoom] intent router failure:\n{failure.getTraceback()}")
-                speaker.msg("I couldn't interpret that. Try starting with: create / destroy / pin / facts.")
-                return None
+            # Suggest-only: no pending state, no y/n.
+            speaker.msg(
+                "I can’t run that as-written, but I think you meant:\n"
+                f"  |wsay computer, {normalized}|n\n"
+                "(Copy/paste that line.)"
+            )
 
-            d.addCallback(_ok)
-            d.addErrback(_fail)
-            return
+        def _fail(failure):
+            logger.log_err(f"[SmartRoom] intent router failure:\n{failure.getTraceback()}")
+            speaker.msg("I couldn't interpret that. Try starting with: create / destroy / pin / facts.")
+            return None
+
+        d.addCallback(_ok)
+        d.addErrback(_fail)
 
     def _run_computer_instruction(self, speaker, instruction: str):
         """
@@ -600,10 +686,10 @@ class SmartRoom(ImageMixin, DefaultRoom):
             return
 
         # destroy
-        m = re.match(r"^(destroy|delete|remove)\b(.*)$", lowinst)
+        m = _DESTROY_RE.match(lowinst)
         if m:
             remainder = instruction[len(m.group(1)):].strip()
-            remainder = re.sub(r"^(the|a|an)\s+", "", remainder, flags=re.IGNORECASE).strip()
+            remainder = _ARTICLE_RE.sub("", remainder).strip()
             removed = delete_object_by_selector(self, remainder)
             if not removed:
                 opts = list_notables_with_dbref(self)
@@ -622,6 +708,18 @@ class SmartRoom(ImageMixin, DefaultRoom):
     # LLM plumbing (thread-safe)
     # ----------------------------
 
+    def _computer(self):
+        """
+        This room's Computer, built once and kept on ndb so its LLM clients
+        (and their pooled HTTP connections) and provider list carry over
+        between commands.
+        """
+        computer = self.ndb.computer
+        if computer is None:
+            computer = Computer(self)
+            self.ndb.computer = computer
+        return computer
+
     def _llm_providers(self):
         providers = [
             LLMProvider(
@@ -653,20 +751,24 @@ class SmartRoom(ImageMixin, DefaultRoom):
         """
         Create a basic prop in this room.
         """
-        # Create off-room so we can set flags BEFORE the move triggers at_object_receive.
         from typeclasses.objects import Object
-        obj = create.create_object(Object, key=key, location=None)
+        attributes = [
+            # Make it show up in our dynamic staging line
+            ("notable", True),
+            # scaffold defaults (facts/affordance)
+            ("facts", []),
+            ("affordance", {"unit": "lb", "weight": 1.0, "immovable": False}),
+        ]
         if shortdesc:
-            obj.db.shortdesc = shortdesc
+            attributes.append(("shortdesc", shortdesc))
         if desc:
-            obj.db.desc = desc
-        # Make it show up in our dynamic staging line
-        obj.db.notable = True
-        # scaffold defaults (facts/affordance)
-        if obj.db.facts is None:
-            obj.db.facts = []
-        if obj.db.affordance is None:
-            obj.db.affordance = {"unit": "lb", "weight": 1.0, "immovable": False}
+            attributes.append(("desc", desc))
+        # create_object batch-adds the Attributes; one transaction covers the
+        # object row and its Attributes instead of a commit per write.
+        with transaction.atomic():
+            obj = create.create_object(Object, key=key, location=None, attributes=attributes)
+        # Created off-room so the flags are set BEFORE the move triggers at_object_receive.
+        # The move runs hooks (and may message), so it stays out of the transaction.
         obj.move_to(self, quiet=True)
         # Trigger object image generation
         if self.image_enabled and self._can_trigger_image():
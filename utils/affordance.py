@@ -1,41 +1,78 @@
 # utils/affordance.py
+from collections.abc import Mapping
+from types import MappingProxyType
 
 DEFAULT_UNIT = "lb"
 
+# Built once at import and read-only; callers get fresh copies of just the
+# mutable parts (the container dict, the manipulations list).
+_TEMPLATE = MappingProxyType({
+    "unit": DEFAULT_UNIT,
+    "weight": 1.0,
+    "immovable": False,
+    "container": MappingProxyType({
+        "is_container": False,
+        "capacity_weight": 0.0,
+        "openable": False,
+        "is_open": True,
+    }),
+    "manipulations": ("pick up", "examine"),
+})
+_TOP_KEYS = tuple(_TEMPLATE)
+_CONTAINER_KEYS = tuple(_TEMPLATE["container"])
+_TOP_KEY_SET = frozenset(_TOP_KEYS)
+_CONTAINER_KEY_SET = frozenset(_CONTAINER_KEYS)
+
+
+def _default_value(key: str, unit: str):
+    """A storable default for top-level `key` (fresh containers, never the template's)."""
+    if key == "unit":
+        return unit
+    if key == "container":
+        return dict(_TEMPLATE["container"])
+    if key == "manipulations":
+        return list(_TEMPLATE["manipulations"])
+    return _TEMPLATE[key]
+
+
 def default_affordance(unit: str = DEFAULT_UNIT) -> dict:
-    return {
-        "unit": unit,
-        "weight": 1.0,
-        "immovable": False,
-        "container": {
-            "is_container": False,
-            "capacity_weight": 0.0,
-            "openable": False,
-            "is_open": True,
-        },
-        "manipulations": ["pick up", "examine"],
-    }
+    return {k: _default_value(k, unit) for k in _TOP_KEYS}
+
+
+def _is_complete(a) -> bool:
+    # key-view superset tests: one C-level set comparison each for plain dicts,
+    # instead of a generator running `in` per key
+    container = a.get("container")
+    return (
+        isinstance(container, Mapping)
+        and a.keys() >= _TOP_KEY_SET
+        and container.keys() >= _CONTAINER_KEY_SET
+    )
+
 
 def ensure_affordance(obj, unit: str = DEFAULT_UNIT) -> dict:
     """
     Ensure obj.db.affordance exists and has required keys.
+    An already-complete affordance is returned as-is, without re-saving it.
     Safe to call from main thread.
     """
     a = obj.db.affordance or {}
-    if not isinstance(a, dict):
+    # stored dicts come back as Evennia _SaverDicts, which aren't dict subclasses
+    if not isinstance(a, Mapping):
         a = {}
-    base = default_affordance(unit=unit)
+    elif _is_complete(a):
+        return a
 
-    # shallow-merge for top level
-    for k, v in base.items():
+    # shallow-merge for top level: only the missing values are built
+    for k in _TOP_KEYS:
         if k not in a:
-            a[k] = v
+            a[k] = _default_value(k, unit)
 
     # nested container merge
-    if not isinstance(a.get("container"), dict):
-        a["container"] = base["container"]
+    if not isinstance(a["container"], Mapping):
+        a["container"] = _default_value("container", unit)
     else:
-        for k, v in base["container"].items():
+        for k, v in _TEMPLATE["container"].items():
             a["container"].setdefault(k, v)
 
     obj.db.affordance = a
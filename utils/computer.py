@@ -1,11 +1,14 @@
 # utils/computer.py
 import json
+from functools import cached_property
+
 from evennia.utils import logger
+from twisted.internet.threads import deferToThread
 
 from utils.computer_prompts import (
-    prop_create_system_prompt,
-    intent_router_system_prompt,
-    prop_edit_system_prompt,
+    PROP_CREATE_SYSTEM_PROMPT,
+    INTENT_ROUTER_SYSTEM_PROMPT,
+    PROP_EDIT_SYSTEM_PROMPT,
 )
 from utils.computer_payloads import (
     build_prop_create_payload,
@@ -16,11 +19,17 @@ from utils.llm_client import build_default_client_from_env, LLMProvider
 from utils.room_director import build_snapshot, generate_from_snapshot
 from utils.affordance import ensure_affordance
 from utils.facts import get_facts
-from utils.room_object_query import iter_notable_props, find_object_by_dbref
+from utils.room_object_query import find_object_by_dbref, iter_notable_props
 
 from collections.abc import Mapping, Sequence
 from django.conf import settings
 
+# Optional C encoder; stdlib json is used when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def _json_safe(x):
     # primitives
     if x is None or isinstance(x, (str, int, float, bool)):
@@ -30,17 +39,66 @@ def _json_safe(x):
     if isinstance(x, (bytes, bytearray)):
         return x.decode("utf-8", errors="replace")
 
-    # mappings (covers Evennia _SaverDict)
+    # mappings (covers Evennia _SaverDict); plain dicts that are already
+    # safe are returned as-is instead of being copied
     if isinstance(x, Mapping):
-        return {str(k): _json_safe(v) for k, v in x.items()}
+        out = {}
+        changed = type(x) is not dict
+        for k, v in x.items():
+            sk = k if type(k) is str else str(k)
+            sv = _json_safe(v)
+            if sk is not k or sv is not v:
+                changed = True
+            out[sk] = sv
+        return out if changed else x
 
     # sequences (covers Evennia _SaverList) but don’t treat strings as sequences
     if isinstance(x, Sequence) and not isinstance(x, (str, bytes, bytearray)):
-        return [_json_safe(v) for v in list(x)]
+        out = [_json_safe(v) for v in x]
+        if type(x) is list and all(a is b for a, b in zip(out, x)):
+            return x
+        return out
 
     # fallback: stringify unknown objects
     return str(x)
 
+def _clean_text(x) -> str:
+    """str()+strip() for fact-like values; bytes are decoded rather than repr'd."""
+    if isinstance(x, (bytes, bytearray)):
+        return x.decode("utf-8", errors="replace").strip()
+    return str(x).strip()
+
+def _json_default(x):
+    """
+    json.dumps(default=...) hook: only called for leaves the encoder can't
+    handle natively (bytes, Evennia _SaverDict/_SaverList, unknown objects).
+    """
+    if isinstance(x, (bytes, bytearray)):
+        return x.decode("utf-8", errors="replace")
+    if isinstance(x, Mapping):
+        return {str(k): v for k, v in x.items()}
+    if isinstance(x, Sequence) and not isinstance(x, str):
+        return list(x)
+    return str(x)
+
+def _dumps(payload) -> str:
+    """Encode a plain-JSON payload (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False)
+
+def _dumps_json_safe(payload) -> str:
+    """Encode payload in a single pass, sanitizing leaves on demand."""
+    try:
+        if orjson is not None:
+            return orjson.dumps(
+                payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        return json.dumps(payload, ensure_ascii=False, default=_json_default)
+    except TypeError:
+        # e.g. non-string keys inside a plain dict; fall back to the full walk
+        return _dumps(_json_safe(payload))
+
 class Computer:
     """
     Room-assistant service object.
@@ -52,9 +110,36 @@ class Computer:
 
     def __init__(self, room):
         self.room = room
+        self._providers = None  # (openai_key, [LLMProvider, ...])
+
+    # ---------- Clients ----------
+    @cached_property
+    def _client(self):
+        """LLM client shared by every call made through this Computer."""
+        return build_default_client_from_env()
+
+    @cached_property
+    def _director_client(self):
+        """
+        Client for thread-safe room rewrites: 120-second timeout, one attempt.
+        Kept separate so these knobs don't leak into the shared client.
+        """
+        client = build_default_client_from_env()
+        client.timeout_s = 120.0
+        client.max_attempts = 1
+        return client
 
     # ---------- Providers ----------
     def llm_providers(self):
+        """
+        Provider list, built once per Computer and rebuilt only if the
+        OpenAI key (which decides whether the fallback exists) changes.
+        """
+        openai_key = getattr(settings, "OPENAI_API_KEY", None)
+        cached = self._providers
+        if cached is not None and cached[0] == openai_key:
+            return cached[1]
+
         providers = [
             LLMProvider(
                 label="LOCAL",
@@ -63,8 +148,7 @@ class Computer:
                 api_key=None,
             )
         ]
-        
-        openai_key = getattr(settings, "OPENAI_API_KEY", None)
+
         if openai_key:
             providers.append(
                 LLMProvider(
@@ -74,53 +158,110 @@ class Computer:
                     api_key=openai_key,
                 )
             )
-            
+
+        self._providers = (openai_key, providers)
         return providers
 
     # ---------- Context ----------
     def _build_messages(self, sys_prompt: str, payload: dict, ensure_json_safe: bool = False):
-        safe_payload = _json_safe(payload) if ensure_json_safe else payload
+        if ensure_json_safe:
+            content = _dumps_json_safe(payload)
+        else:
+            content = _dumps(payload)
         return [
             {"role": "system", "content": sys_prompt},
-            {"role": "user", "content": json.dumps(safe_payload, ensure_ascii=False)},
+            {"role": "user", "content": content},
         ]
 
     def _chat_json(self, messages):
-        client = build_default_client_from_env()
-        return client.chat_json(self.llm_providers(), messages)
+        return self._client.chat_json(self.llm_providers(), messages)
 
-    def notable_objects_packet(self, include_desc=True, max_desc_chars=500):
-        out = []
+    def _notable_columns(self):
+        """
+        Column-wise snapshot of the room's notable props:
+          {"dbref": [...], "key": [...], "shortdesc": [...], "desc": [...],
+           "facts": [...], "affordance": [...]}
+        Attribute reads happen once per object per call.
+        """
+        return self._notable_snapshot()[0]
+
+    def _notable_snapshot(self):
+        """
+        (columns, {dbref: row}) from one pass, so a caller can pair columns
+        with their rows. Built fresh on every call: nothing cheap changes
+        when a prop's key, shortdesc, facts or affordance is written, so a
+        cached copy could go stale without anyone noticing.
+        """
+        cols = {"dbref": [], "key": [], "shortdesc": [], "desc": [], "facts": [], "affordance": []}
         for obj in iter_notable_props(self.room):
             ensure_affordance(obj)  # scaffold if missing
+            db = obj.db
+            cols["dbref"].append(str(obj.dbref))
+            cols["key"].append(obj.key)
+            cols["shortdesc"].append(db.shortdesc or str(obj.key))
+            cols["desc"].append(db.desc or "")
+            cols["facts"].append(get_facts(obj))
+            cols["affordance"].append(db.affordance)
+
+        rows = {dbref: i for i, dbref in enumerate(cols["dbref"])}
+        return cols, rows
+
+    def notable_anchors(self, cols=None):
+        """
+        Slim [{key, shortdesc, dbref}] view of the notable props for prompt
+        payloads; skips building the full packet (desc/facts/affordance).
+        """
+        if cols is None:
+            cols = self._notable_columns()
+        return [
+            {"key": key, "shortdesc": shortdesc, "dbref": dbref}
+            for dbref, key, shortdesc in zip(cols["dbref"], cols["key"], cols["shortdesc"])
+        ]
 
-            desc = (obj.db.desc or "")
+    def notable_objects_packet(self, include_desc=True, max_desc_chars=500):
+        cols = self._notable_columns()
+        out = []
+        for dbref, key, shortdesc, desc, facts, affordance in zip(
+            cols["dbref"], cols["key"], cols["shortdesc"], cols["desc"], cols["facts"], cols["affordance"]
+        ):
             if include_desc and desc:
                 desc = desc.strip()[:max_desc_chars]
             else:
                 desc = ""
 
             out.append({
-                "dbref": str(obj.dbref),
-                "key": obj.key,
-                "shortdesc": (obj.db.shortdesc or str(obj.key)),
+                "dbref": dbref,
+                "key": key,
+                "shortdesc": shortdesc,
                 "desc": desc,
-                "facts": get_facts(obj),
-                "affordance": obj.db.affordance,
+                "facts": facts,
+                "affordance": affordance,
             })
         return out
 
     def room_memory_text(self, max_chars=3000):
-        mem = self.room.db.memory or []
-        text = "\n".join(f'{m.get("who","?")}: {m.get("msg","")}' for m in mem)
+        # SmartRoom keeps the live buffer as a deque on ndb and only saves it
+        # to db.memory in batches. Copy it first: this can run on a worker
+        # thread while the reactor appends, and tuple() copies in one C call.
+        live = getattr(getattr(self.room, "ndb", None), "memory", None)
+        mem = tuple(live) if live is not None else (self.room.db.memory or [])
+        # Walk back from the newest line and stop once the tail covers max_chars,
+        # so the cost is bounded by max_chars rather than by len(memory).
+        buf, total = [], 0
+        for m in reversed(mem):
+            line = f'{m.get("who","?")}: {m.get("msg","")}'
+            buf.append(line)
+            total += len(line) + 1  # line plus its joining newline
+            if total > max_chars:
+                break
+        text = "\n".join(reversed(buf))
         return text[-max_chars:]
 
     # ---------- Director: refine room ----------
     def director_snapshot(self):
         r = self.room
         # Evennia attributes may be _SaverList; coerce to plain list for JSON safety.
-        facts = r.db.director_facts or []
-        facts = [str(f).strip() for f in list(facts) if str(f).strip()]
+        facts = [t for t in map(_clean_text, r.db.director_facts or ()) if t]
         return build_snapshot(
             room_key=r.key,
             previous_desc=r.db.desc or "",
@@ -134,8 +275,7 @@ class Computer:
         )
 
     def generate_room_desc(self, snapshot: dict) -> dict:
-        client = build_default_client_from_env()
-        return generate_from_snapshot(client, self.llm_providers(), snapshot)
+        return generate_from_snapshot(self._client, self.llm_providers(), snapshot)
 
     def generate_room_desc_safe(self, snapshot: dict) -> dict:
         """
@@ -143,22 +283,27 @@ class Computer:
         Uses a 120-second timeout to see if the LLM actually returns,
         or if the call is perpetually slow / returns None.
         """
-        client = build_default_client_from_env()
-        client.timeout_s = 120.0
-        client.max_attempts = 1
-        return generate_from_snapshot(client, self.llm_providers(), snapshot)
+        return generate_from_snapshot(self._director_client, self.llm_providers(), snapshot)
+
+    def generate_room_desc_deferred(self, snapshot: dict):
+        """
+        Run generate_room_desc_safe on the reactor thread pool; returns a Deferred.
+        Calls started this way overlap with each other (e.g. a rewrite and an
+        intent lookup), so the wait is the slower call, not the sum.
+        """
+        return deferToThread(self.generate_room_desc_safe, snapshot)
 
     # ---------- Writer: create prop ----------
     def generate_prop_json(self, speaker_key: str, instruction: str) -> dict:
         """
         Thread-safe: returns {key, shortdesc, desc, affordance?, facts?}
         """
-        sys_prompt = prop_create_system_prompt()
+        sys_prompt = PROP_CREATE_SYSTEM_PROMPT
 
 
         room_desc = (self.room.db.desc or "").strip()
         memory = self.room_memory_text(max_chars=2000)
-        anchors = self.notable_objects_packet(include_desc=False)
+        anchors = self.notable_anchors()
 
         user_payload = build_prop_create_payload(
             player=speaker_key,
@@ -181,6 +326,10 @@ class Computer:
                     break
         return data
 
+    def generate_prop_json_deferred(self, speaker_key: str, instruction: str):
+        """generate_prop_json on the reactor thread pool; returns a Deferred."""
+        return deferToThread(self.generate_prop_json, speaker_key, instruction)
+
     def predict_intent(self, speaker_key: str, utterance: str) -> dict:
         """
         Thread-safe: Ask LLM to classify unknown 'computer' requests into a concrete command.
@@ -189,11 +338,11 @@ class Computer:
            "normalized": "<computer instruction to run if confirmed>",
            "question": "<yes/no question>"}
         """
-        sys_prompt = intent_router_system_prompt()
+        sys_prompt = INTENT_ROUTER_SYSTEM_PROMPT
 
         room_desc = (self.room.db.desc or "").strip()
         memory = self.room_memory_text(max_chars=1500)
-        anchors = self.notable_objects_packet(include_desc=False)
+        anchors = self.notable_anchors()
 
         user_payload = build_intent_payload(
             player=speaker_key,
@@ -206,6 +355,10 @@ class Computer:
         messages = self._build_messages(sys_prompt, user_payload, ensure_json_safe=False)
         return self._chat_json(messages)
 
+    def predict_intent_deferred(self, speaker_key: str, utterance: str):
+        """predict_intent on the reactor thread pool; returns a Deferred."""
+        return deferToThread(self.predict_intent, speaker_key, utterance)
+
     def generate_prop_edit_json(self, speaker_key: str, instruction: str, target_dbref: str) -> dict:
         """
         Thread-safe: returns {dbref, key, shortdesc, desc}
@@ -216,28 +369,34 @@ class Computer:
         if not target:
             return {"dbref": "", "key": "", "shortdesc": "", "desc": ""}
 
-        sys_prompt = prop_edit_system_prompt()
+        sys_prompt = PROP_EDIT_SYSTEM_PROMPT
 
         room_desc = (self.room.db.desc or "").strip()
         memory = self.room_memory_text(max_chars=1500)
 
         # room facts: pinned facts on the room + director facts (if any)
-        pinned_room_facts = [f.get("text") for f in get_facts(self.room) if isinstance(f, dict) and f.get("text")]
+        pinned_room_facts = [f.get("text") for f in get_facts(self.room) if isinstance(f, Mapping) and f.get("text")]
         director_facts = list(self.room.db.director_facts or [])
 
         ensure_affordance(target)
 
+        cols, rows = self._notable_snapshot()
+        anchors = self.notable_anchors(cols)
+
+        # Notable targets already had their facts read for the anchors snapshot.
+        dbref = str(target.dbref)
+        row = rows.get(dbref)
+        target_facts = cols["facts"][row] if row is not None else get_facts(target)
+
         target_packet = {
-            "dbref": str(target.dbref),
+            "dbref": dbref,
             "key": target.key,
             "shortdesc": (target.db.shortdesc or str(target.key)),
             "desc": (target.db.desc or ""),
-            "facts": get_facts(target),
+            "facts": target_facts,
             "affordance": target.db.affordance,
         }
 
-        anchors = self.notable_objects_packet(include_desc=False)
-
         user_payload = build_prop_edit_payload(
             player=speaker_key,
             instruction=instruction,
@@ -250,3 +409,7 @@ class Computer:
 
         messages = self._build_messages(sys_prompt, user_payload, ensure_json_safe=True)
         return self._chat_json(messages)
+
+    def generate_prop_edit_json_deferred(self, speaker_key: str, instruction: str, target_dbref: str):
+        """generate_prop_edit_json on the reactor thread pool; returns a Deferred."""
+        return deferToThread(self.generate_prop_edit_json, speaker_key, instruction, target_dbref)
@@ -4,6 +4,13 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 
+def _anchors_view(anchors: List[Dict[str, Any]], with_dbref: bool) -> List[Dict[str, Any]]:
+    """Slim per-anchor dicts for a prompt; one fixed-shape literal per anchor."""
+    if with_dbref:
+        return [{"key": a["key"], "shortdesc": a["shortdesc"], "dbref": a["dbref"]} for a in anchors]
+    return [{"key": a["key"], "shortdesc": a["shortdesc"]} for a in anchors]
+
+
 def build_prop_create_payload(
     *,
     player: str,
@@ -16,7 +23,7 @@ def build_prop_create_payload(
         "player": player,
         "instruction": instruction,
         "room_desc": room_desc,
-        "notable_anchors": [{"key": a["key"], "shortdesc": a["shortdesc"]} for a in anchors],
+        "notable_anchors": _anchors_view(anchors, with_dbref=False),
         "recent_memory": recent_memory,
     }
 
@@ -33,7 +40,7 @@ def build_intent_payload(
         "player": player,
         "utterance": utterance,
         "room_desc": room_desc,
-        "notable_anchors": [{"key": a["key"], "shortdesc": a["shortdesc"], "dbref": a["dbref"]} for a in anchors],
+        "notable_anchors": _anchors_view(anchors, with_dbref=True),
         "recent_memory": recent_memory,
     }
 
@@ -54,6 +61,6 @@ def build_prop_edit_payload(
         "room_desc": room_desc,
         "room_facts": room_facts,
         "target": target,
-        "notable_anchors": [{"key": a["key"], "shortdesc": a["shortdesc"], "dbref": a["dbref"]} for a in anchors],
+        "notable_anchors": _anchors_view(anchors, with_dbref=True),
         "recent_memory": recent_memory,
     }
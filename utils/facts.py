@@ -1,43 +1,83 @@
 # utils/facts.py
+import random
 import time
-import secrets
+from collections.abc import Mapping, MutableSequence
+
+# Fact ids only need to be short and unlikely to collide (players type them
+# back to unpin), not unguessable: draw them from a PRNG seeded once from
+# os.urandom instead of making a urandom syscall per fact like secrets would.
+_fact_ids = random.Random()
+
+def _fact_id() -> str:
+    return f"fact_{_fact_ids.getrandbits(24):06x}"
 
 def new_fact(text: str, created_by: str = "", scope: str = "local", strength: float = 0.6, tags=None) -> dict:
     return {
-        "id": f"fact_{secrets.token_hex(3)}",
+        "id": _fact_id(),
         "text": text.strip(),
         "scope": scope,           # local | room | carried | worn (later)
         "strength": float(strength),
         "tags": tags or [],
         "created_by": created_by,
-        "created_ts": float(time.time()),
+        "created_ts": time.time(),
     }
 
-def add_fact(obj, fact: dict):
-    facts = obj.db.facts or []
-    if not isinstance(facts, list):
-        facts = []
+def _stored_facts(obj):
+    """obj.db.facts read once; None unless it is list-like."""
+    facts = obj.db.facts
+    # persisted lists come back as Evennia _SaverLists, which aren't list subclasses
+    if type(facts) is list or isinstance(facts, MutableSequence):
+        return facts
+    return None
+
+# cap on obj.db.facts: the whole list is re-pickled on every save
+MAX_FACTS_PER_OBJ = 64
+
+def _strength(fact) -> float:
+    try:
+        return float(fact.get("strength", 0.0))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+def add_fact(obj, fact: dict, max_facts: int = MAX_FACTS_PER_OBJ):
+    """
+    Append `fact`, then trim back to `max_facts` by dropping the weakest
+    older facts (oldest first among equal strength). The new fact is kept.
+    """
+    stored = _stored_facts(obj)
+    # plain copy: appending to a stored _SaverList would save it once already
+    facts = list(stored) if stored is not None else []
+    excess = len(facts) + 1 - max_facts
+    if excess > 0:
+        victims = set(sorted(range(len(facts)), key=lambda i: _strength(facts[i]))[:excess])
+        facts = [f for i, f in enumerate(facts) if i not in victims]
     facts.append(fact)
     obj.db.facts = facts
 
 def get_facts(obj) -> list:
-    facts = obj.db.facts or []
-    return facts if isinstance(facts, list) else []
+    facts = _stored_facts(obj)
+    return facts if facts is not None else []
 
 def remove_fact(obj, fact_id: str) -> bool:
-    facts = obj.db.facts or []
-    if not isinstance(facts, list):
+    """
+    Drop the fact with `fact_id`; True if one was removed.
+    One filtering pass, no id index: saving the Attribute re-pickles the whole
+    list anyway, so an index could not make removal cheaper than O(N).
+    """
+    facts = _stored_facts(obj)
+    if facts is None:
         return False
-    before = len(facts)
-    facts = [f for f in facts if isinstance(f, dict) and f.get("id") != fact_id]
-    obj.db.facts = facts
-    return len(facts) != before
+    kept = [f for f in facts if not (isinstance(f, Mapping) and f.get("id") == fact_id)]
+    if len(kept) == len(facts):
+        # nothing matched: leave the stored list (and its Attribute) untouched
+        return False
+    obj.db.facts = kept
+    return True
 
 def fact_texts(obj) -> list[str]:
-    out = []
-    for f in get_facts(obj):
-        if isinstance(f, dict):
-            t = str(f.get("text") or "").strip()
-            if t:
-                out.append(t)
-    return out
+    return [
+        t
+        for f in get_facts(obj)
+        # persisted facts are _SaverDicts: Mappings, not dict subclasses
+        if isinstance(f, Mapping) and (t := str(f.get("text") or "").strip())
+    ]
@@ -0,0 +1,55 @@
+# utils/llm_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+
+def response_key(prompt: str, models: Iterable[Any] = ()) -> str:
+    """Compact cache key for a serialized prompt sent to the given model(s)."""
+    h = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16)
+    for model in models:
+        h.update(b"\0" + str(model).encode("utf-8"))
+    return h.hexdigest()
+
+
+class TTLCache:
+    """
+    Small LRU cache whose entries also expire after `ttl_s` seconds.
+    Safe to share between the reactor and worker threads.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 300.0):
+        self.max_entries = int(max_entries)
+        self.ttl_s = float(ttl_s)
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The cached value, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl_s
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
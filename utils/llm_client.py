@@ -13,20 +13,90 @@ import json
 import os
 import random
 import re
+import threading
 import time
 import traceback
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Iterable, List, Optional
 
-import httpx
+# Optional C encoder/decoder; stdlib json (inside httpx) is used without it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Evennia logger is safe to import; we only log strings.
 from evennia.utils import logger
 
+from utils.llm_cache import TTLCache, response_key
+
 
 JsonDict = Dict[str, Any]
 Messages = List[Dict[str, str]]
 
+# Process-wide httpx pool for clients built with share_http=True:
+# {(base_url, timeout_s): httpx.Client}, so every room's calls to the same
+# endpoint reuse the same keep-alive/TLS connections.
+_SHARED_HTTP: Dict[Any, Any] = {}
+_SHARED_HTTP_LOCK = threading.Lock()
+
+# Process-wide exact-match reply cache used by build_default_client_from_env
+# when replies are deterministic (see there); created on first use.
+_SHARED_RESPONSES: Optional[TTLCache] = None
+_SHARED_RESPONSES_LOCK = threading.Lock()
+
+def _load_httpx():
+    """Import httpx on first use; it is only needed once a request is sent."""
+    global httpx
+    import httpx
+    return httpx
+
+
+def __getattr__(name):
+    # `llm_client.httpx` (e.g. tests patching httpx.Client) loads it on demand.
+    if name == "httpx":
+        return _load_httpx()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=32)
+def _provider_order_line(providers: tuple) -> str:
+    """The "[LLM] Provider order" log line, formatted once per provider set."""
+    return "[LLM] Provider order: " + ", ".join(
+        f"{p.label}(model={p.model!r}, base_url={p.base_url!r}, api_key={'set' if p.api_key else 'unset'})"
+        for p in providers
+    )
+
+
+def _retry_after_s(r) -> Optional[float]:
+    """Seconds from a 429/503 Retry-After header; None if absent or an HTTP-date."""
+    if r.status_code not in (429, 503):
+        return None
+    headers = getattr(r, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _response_json(r) -> Any:
+    """Decode an HTTP response body, with orjson straight from the raw bytes when available."""
+    if orjson is not None:
+        body = getattr(r, "content", None)
+        if isinstance(body, (bytes, bytearray)):
+            return orjson.loads(body)
+    return r.json()
+
+
+_THINKING_RE = re.compile(r"<thinking>.*?</thinking>", flags=re.DOTALL)
+_FLAT_OBJECT_RE = re.compile(r"\{[^{}]*\}")
+_JSON_DECODER = json.JSONDecoder()
+_FIELD_RES = tuple(
+    re.compile(p)
+    for p in (r'"desc"\s*:\s*"([^"]+)"', r'"key"\s*:\s*"([^"]+)":', r'"shortdesc"\s*:\s*"([^"]+)"')
+)
+
 
 @dataclass(frozen=True)
 class LLMProvider:
@@ -35,6 +105,11 @@ class LLMProvider:
     model: Optional[str] = None
     api_key: Optional[str] = None
 
+    @cached_property
+    def cache_identity(self) -> str:
+        """Who answers a request, for reply-cache keys; never includes the API key."""
+        return f"{self.label}|{self.base_url}|{self.model}"
+
 
 class LLMClient:
     """
@@ -50,25 +125,61 @@ class LLMClient:
         timeout_s: float = 30.0,
         max_attempts: int = 2,
         temperature: float = 0.6,
-        no_temperature_models: Optional[set[str]] = None,
+        no_temperature_models: Optional[Iterable[str]] = None,
+        json_mode_models: Optional[Iterable[str]] = None,
+        base_delay_s: float = 0.25,
+        max_backoff_s: float = 5.0,
+        share_http: bool = False,
+        response_cache: Optional[TTLCache] = None,
     ):
         self.timeout_s = float(timeout_s)
         self.max_attempts = int(max_attempts)
         self.temperature = float(temperature)
-        self.no_temperature_models = no_temperature_models or {"gpt-5-mini"}
+        self.no_temperature_models = frozenset(no_temperature_models or {"gpt-5-mini"})
+        # Models that accept response_format={"type": "json_object"}; their
+        # replies come back as strict JSON and skip the extraction fallbacks.
+        self.json_mode_models = frozenset(json_mode_models or ())
+        self.base_delay_s = float(base_delay_s)
+        self.max_backoff_s = float(max_backoff_s)
+        # One pooled httpx.Client per (base_url, timeout), created on first
+        # request so retries and later calls reuse its keep-alive connections;
+        # share_http=True uses the process-wide pool instead of a private one.
+        if share_http:
+            self._http, self._http_lock = _SHARED_HTTP, _SHARED_HTTP_LOCK
+        else:
+            self._http, self._http_lock = {}, threading.Lock()
+        # Optional {prompt key: parsed reply} cache; only worth setting when
+        # the same messages should get the same answer (temperature 0).
+        self.response_cache = response_cache
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP connections (safe to call more than once).
+        A share_http client only detaches: other clients still use the pool.
+        """
+        clients, self._http = self._http, {}
+        if clients is _SHARED_HTTP:
+            return
+        for client in clients.values():
+            client.close()
 
     def chat_json(self, providers: List[LLMProvider], messages: Messages) -> JsonDict:
         """
         Try providers in order; return first successful JSON object.
         Raises RuntimeError if all fail.
         """
-        logger.log_info(
-            "[LLM] Provider order: "
-            + ", ".join(
-                f"{p.label}(model={p.model!r}, base_url={p.base_url!r}, api_key={'set' if p.api_key else 'unset'})"
-                for p in providers
-            )
-        )
+        try:
+            order = _provider_order_line(tuple(providers))
+        except TypeError:  # unhashable provider objects: just format it
+            order = _provider_order_line.__wrapped__(tuple(providers))
+        logger.log_info(order)
+
+        cache = self.response_cache
+        if cache is not None:
+            key = self._response_cache_key(providers, messages)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
 
         last_exc: Optional[Exception] = None
         for provider in providers:
@@ -76,6 +187,8 @@ class LLMClient:
                 out = self._call_chat_completions_json(provider, messages)
                 if out is None:
                     raise RuntimeError("Provider returned no JSON (None)")
+                if cache is not None:
+                    cache.put(key, out)
                 return out
             except Exception as exc:
                 last_exc = exc
@@ -89,6 +202,16 @@ class LLMClient:
     # Internal
     # -------------------------
 
+    def _response_cache_key(self, providers: List[LLMProvider], messages: Messages) -> str:
+        """Reply-cache key: the exact messages, per provider chain and temperature."""
+        if orjson is not None:
+            prompt = orjson.dumps(messages).decode("utf-8")
+        else:
+            prompt = json.dumps(messages, ensure_ascii=False, separators=(",", ":"))
+        models = [p.cache_identity for p in providers]
+        models.append(f"temperature={self.temperature}")
+        return response_key(prompt, models)
+
     def _call_chat_completions_json(self, provider: LLMProvider, messages: Messages) -> Optional[JsonDict]:
         """
         Returns parsed JSON dict or None on exhaustion.
@@ -124,6 +247,9 @@ class LLMClient:
         if provider.model not in self.no_temperature_models:
             payload["temperature"] = self.temperature
 
+        if provider.model in self.json_mode_models:
+            payload["response_format"] = {"type": "json_object"}
+
         # Log the full request payload (compact)
         logger.log_info(
             f"[LLM:{provider.label}] REQUEST model={provider.model!r} "
@@ -134,10 +260,15 @@ class LLMClient:
         )
 
         last_err = None
+        prev_delay = self.base_delay_s
         for attempt in range(1, self.max_attempts + 1):
+            retry_after = None
             try:
-                with httpx.Client(timeout=self.timeout_s) as client:
-                    r = client.post(url, headers=headers, json=payload)
+                http = self._http_client(provider.base_url)
+                if orjson is not None:
+                    r = http.post(url, headers=headers, content=orjson.dumps(payload))
+                else:
+                    r = http.post(url, headers=headers, json=payload)
 
                 if r.status_code >= 400:
                     body_snip = (r.text or "")[:1200]
@@ -146,14 +277,15 @@ class LLMClient:
                         f"Body: {body_snip!r}"
                     )
                     last_err = f"HTTP {r.status_code}"
+                    retry_after = _retry_after_s(r)
                 else:
-                    data = r.json()
+                    data = _response_json(r)
                     content = data["choices"][0]["message"]["content"]
                     
                     # Log successful response (compact)
                     logger.log_info(
                         f"[LLM:{provider.label}] RESPONSE status={r.status_code} "
-                        f"content[:400]={content[:400]!r}"
+                        f"content[:400]={str(content)[:400]!r}"
                     )
                     parsed = self._extract_json_from_text(content, label=provider.label)
                     if parsed is not None:
@@ -174,15 +306,46 @@ class LLMClient:
                     f"[LLM:{provider.label}] Exception attempt {attempt}: {exc!r}\n{traceback.format_exc()}"
                 )
 
-            # small backoff + jitter
-            time.sleep(0.25 + random.random() * 0.5 + attempt * 0.2)
+            if attempt < self.max_attempts:
+                prev_delay = self._backoff_delay(prev_delay)
+                if retry_after is not None:
+                    if retry_after > self.max_backoff_s:
+                        # the provider asked for longer than we'd block a worker
+                        # thread: give the next provider a turn instead
+                        logger.log_warn(
+                            f"[LLM:{provider.label}] Retry-After {retry_after:g}s exceeds "
+                            f"max_backoff_s={self.max_backoff_s:g}; not retrying"
+                        )
+                        break
+                    prev_delay = max(prev_delay, retry_after)
+                time.sleep(prev_delay)
 
         logger.log_err(f"[LLM:{provider.label}] Exhausted attempts. Last error: {last_err}")
         return None
 
+    def _http_client(self, base_url: str):
+        key = (base_url, self.timeout_s)
+        client = self._http.get(key)
+        if client is None:
+            # worker threads can race here on first use; build only one
+            with self._http_lock:
+                client = self._http.get(key)
+                if client is None:
+                    client = _load_httpx().Client(timeout=self.timeout_s)
+                    self._http[key] = client
+        return client
+
+    def _backoff_delay(self, prev_delay: float) -> float:
+        """Decorrelated jitter: uniform in [base, 3 * prev], capped at max_backoff_s."""
+        base = self.base_delay_s
+        high = max(base, prev_delay * 3)
+        return min(self.max_backoff_s, base + random.random() * (high - base))
+
     def _strip_thinking_tags(self, text: str) -> str:
         """Strip <thinking>...</thinking> blocks from reasoning-model outputs (Qwen3, etc.)."""
-        return re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL)
+        if "<thinking>" not in text:
+            return text
+        return _THINKING_RE.sub("", text)
 
     def _is_required_fields_missing(self, response: JsonDict, messages: Messages) -> bool:
         """Check if a response is missing required schema fields based on the prompt.
@@ -217,25 +380,56 @@ class LLMClient:
     def _extract_json_from_text(self, text: Any, label: str) -> Optional[JsonDict]:
         if text is None:
             return None
+        if isinstance(text, dict):
+            # some JSON-mode servers hand back the object already decoded
+            return text
 
-        t = str(text).strip()
+        t = (text if type(text) is str else str(text)).strip()
+
+        # Fast path: the reply is already strict JSON (the common case).
+        # orjson when available; what it rejects (e.g. NaN) gets another go
+        # from the stdlib decoder in the raw_decode step below.
+        if t[:1] == "{":
+            try:
+                obj = orjson.loads(t) if orjson is not None else json.loads(t)
+                if isinstance(obj, dict):
+                    return obj
+            except Exception:
+                pass
+        elif "{" not in t:
+            # no brace anywhere: none of the fallbacks below can find an object
+            logger.log_err(f"[LLM:{label}] No JSON object found. Raw (first 800): {t[:800]!r}")
+            return None
 
         # Strip <thinking>...</thinking> blocks from reasoning-model outputs
-        t = self._strip_thinking_tags(t)
+        raw, t = t, self._strip_thinking_tags(t)
 
-        # Try parsing the entire text as JSON first (handles nested objects)
-        try:
-            obj = json.loads(t)
-            if isinstance(obj, dict):
-                return obj
-        except Exception:
-            pass
-
-        # Try greedy match on the whole text for nested JSON
-        m = re.search(r"\{.*\}", t, flags=re.DOTALL)
-        if m:
+        # Try parsing the entire text as JSON (handles nested objects),
+        # unless the fast path above already tried this exact text
+        if t is not raw or raw[:1] != "{":
+            try:
+                obj = json.loads(t)
+                if isinstance(obj, dict):
+                    return obj
+            except Exception:
+                pass
+
+        # Try the greedy span from the first '{' to the last '}' (nested JSON);
+        # skip it when that span is the whole text, which was just parsed above
+        start, end = t.find("{"), t.rfind("}")
+        if 0 <= start < end:
+            if (start, end) != (0, len(t) - 1):
+                try:
+                    obj = json.loads(t[start:end + 1])
+                    if isinstance(obj, dict):
+                        return obj
+                except Exception:
+                    pass
+
+            # Braces in trailing prose spoil the greedy span; decode the one
+            # balanced object that starts at the first '{' and ignore the rest
             try:
-                obj = json.loads(m.group(0))
+                obj, _end = _JSON_DECODER.raw_decode(t, start)
                 if isinstance(obj, dict):
                     return obj
             except Exception:
@@ -245,7 +439,7 @@ class LLMClient:
         # unpack one level (e.g., {"object": {...}} or {"result": {...}})
         # and return the innermost dict that has the schema fields.
         candidates: list[tuple[int, JsonDict]] = []
-        for match in re.finditer(r"\{[^{}]*\}", t):
+        for match in _FLAT_OBJECT_RE.finditer(t):
             try:
                 obj = json.loads(match.group(0))
                 if isinstance(obj, dict):
@@ -257,8 +451,8 @@ class LLMClient:
             return candidates[-1][1]
 
         # Last resort: try to find JSON-like patterns in the text
-        for pattern in [r'"desc"\s*:\s*"([^"]+)"', r'"key"\s*:\s*"([^"]+)":', r'"shortdesc"\s*:\s*"([^"]+)"']:
-            m = re.search(pattern, t)
+        for pattern in _FIELD_RES:
+            m = pattern.search(t)
             if m:
                 break
 
@@ -268,12 +462,42 @@ class LLMClient:
 
 def build_default_client_from_env() -> LLMClient:
     """
-    Build a client with env-configurable knobs.
+    Build a client with env-configurable knobs. Its HTTP connections come
+    from the process-wide pool.
     """
     timeout_s = float(os.getenv("LLM_TIMEOUT_S", "180"))
     max_attempts = int(os.getenv("LLM_MAX_ATTEMPTS", "2"))
     temperature = float(os.getenv("LLM_TEMPERATURE", "0.6"))
     # Comma-separated model IDs that should omit temperature
     raw = os.getenv("LLM_NO_TEMPERATURE_MODELS", "gpt-5-mini")
-    no_temp = {m.strip() for m in raw.split(",") if m.strip()}
-    return LLMClient(timeout_s=timeout_s, max_attempts=max_attempts, temperature=temperature, no_temperature_models=no_temp)
+    no_temp = frozenset(m for m in (s.strip() for s in raw.split(",")) if m)
+    # Comma-separated model IDs that support OpenAI JSON mode
+    raw = os.getenv("LLM_JSON_MODE_MODELS", "")
+    json_mode = frozenset(m for m in (s.strip() for s in raw.split(",")) if m)
+    base_delay_s = float(os.getenv("LLM_BASE_DELAY_S", "0.25"))
+    max_backoff_s = float(os.getenv("LLM_MAX_BACKOFF_S", "5.0"))
+    # Exact-prompt reply cache: on when replies are deterministic
+    # (temperature 0) or when LLM_CACHE_FORCE=1 asks for it anyway.
+    use_cache = temperature == 0 or os.getenv("LLM_CACHE_FORCE", "0") == "1"
+    return LLMClient(
+        timeout_s=timeout_s,
+        max_attempts=max_attempts,
+        temperature=temperature,
+        no_temperature_models=no_temp,
+        json_mode_models=json_mode,
+        base_delay_s=base_delay_s,
+        max_backoff_s=max_backoff_s,
+        share_http=True,
+        response_cache=_shared_response_cache() if use_cache else None,
+    )
+
+
+def _shared_response_cache() -> TTLCache:
+    global _SHARED_RESPONSES
+    with _SHARED_RESPONSES_LOCK:
+        if _SHARED_RESPONSES is None:
+            _SHARED_RESPONSES = TTLCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+                ttl_s=float(os.getenv("LLM_CACHE_TTL_S", "3600")),
+            )
+        return _SHARED_RESPONSES
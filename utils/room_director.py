@@ -1,5 +1,12 @@
 # utils/room_director.py
 import json
+from typing import Final
+
+# Optional C encoder; the stdlib json module is used without it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def build_snapshot(room_key, previous_desc, previous_generated_desc, facts, objects, memory_text):
@@ -16,44 +23,50 @@ def build_snapshot(room_key, previous_desc, previous_generated_desc, facts, obje
     }
 
 
+DIRECTOR_SYSTEM_PROMPT: Final[str] = (
+    "You are SmartRoomDirector for a text MUD.\n"
+    "Rewrite the ROOM BASE DESCRIPTION to match the current contents and recent conversation.\n"
+    "\n"
+    "IMPORTANT GROUNDING RULES:\n"
+    "- Objects currently present are authoritative reality.\n"
+    "- Do NOT mention any entity unless it is:\n"
+    "  • present in the objects list, OR\n"
+    "  • explicitly supported by current facts, OR\n"
+    "  • explicitly indicated by recent memory as intentionally present.\n"
+    "- Previous descriptions are advisory only and MUST NOT introduce entities.\n"
+    "- If an entity appeared previously but is not grounded above, REMOVE IT.\n"
+    "\n"
+    "Return STRICT JSON ONLY (no markdown, no extra text).\n"
+    'Schema: {"desc": str, "facts": [str]}\n'
+    "\n"
+    "Rules:\n"
+    "- desc: 1–2 short paragraphs, present tense, evocative but not purple-prose.\n"
+    "- Do NOT list every object; weave only the most salient into scene dressing.\n"
+    "- Use objects to infer indoor/outdoor/season/mood.\n"
+    "- facts: 3–10 short, stable anchors.\n"
+    "- Facts MUST be grounded in objects or room-wide truths (e.g. mood, setting).\n"
+    "- If objects conflict, you may shift the scene.\n"
+    "- Only preserve intentional oddities if memory clearly indicates intent.\n"
+)
+
+
 def build_messages(snapshot: dict):
     """
     Build messages for the room-director LLM call.
     Strict JSON output: {"desc": str, "facts": [str]}
     """
-    sys_prompt = (
-        "You are SmartRoomDirector for a text MUD.\n"
-        "Rewrite the ROOM BASE DESCRIPTION to match the current contents and recent conversation.\n"
-        "\n"
-        "IMPORTANT GROUNDING RULES:\n"
-        "- Objects currently present are authoritative reality.\n"
-        "- Do NOT mention any entity unless it is:\n"
-        "  • present in the objects list, OR\n"
-        "  • explicitly supported by current facts, OR\n"
-        "  • explicitly indicated by recent memory as intentionally present.\n"
-        "- Previous descriptions are advisory only and MUST NOT introduce entities.\n"
-        "- If an entity appeared previously but is not grounded above, REMOVE IT.\n"
-        "\n"
-        "Return STRICT JSON ONLY (no markdown, no extra text).\n"
-        'Schema: {"desc": str, "facts": [str]}\n'
-        "\n"
-        "Rules:\n"
-        "- desc: 1–2 short paragraphs, present tense, evocative but not purple-prose.\n"
-        "- Do NOT list every object; weave only the most salient into scene dressing.\n"
-        "- Use objects to infer indoor/outdoor/season/mood.\n"
-        "- facts: 3–10 short, stable anchors.\n"
-        "- Facts MUST be grounded in objects or room-wide truths (e.g. mood, setting).\n"
-        "- If objects conflict, you may shift the scene.\n"
-        "- Only preserve intentional oddities if memory clearly indicates intent.\n"
-    )
-
     prev = snapshot.get("previous_generated_desc") or snapshot.get("previous_desc") or ""
 
-    # Coerce Evennia _SaverList / other odd types into JSON-safe plain values.
+    # Coerce Evennia _SaverList / other odd types into JSON-safe plain values;
+    # repeated facts (the director often echoes its own) are sent once.
     facts_raw = snapshot.get("facts") or []
-    facts = [str(f).strip() for f in list(facts_raw) if str(f).strip()]
-    objects_raw = snapshot.get("objects") or []
-    objects = list(objects_raw)
+    facts = list(dict.fromkeys(t for f in facts_raw if (t := str(f).strip())))
+    objects = snapshot.get("objects") or []
+    # every object in the list is notable, so the flag says nothing to the model
+    objects = [
+        {k: v for k, v in o.items() if k != "notable"} if isinstance(o, dict) and "notable" in o else o
+        for o in objects
+    ]
 
     payload = {
         "room_key": snapshot.get("room_key"),
@@ -63,9 +76,15 @@ def build_messages(snapshot: dict):
         "memory": snapshot.get("memory") or "",
     }
 
+    # compact separators: fewer bytes (and tokens) per request
+    if orjson is not None:
+        content = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    else:
+        content = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
     return [
-        {"role": "system", "content": sys_prompt},
-        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+        {"role": "system", "content": DIRECTOR_SYSTEM_PROMPT},
+        {"role": "user", "content": content},
     ]
 
 
@@ -1,31 +1,72 @@
 # utils/room_object_query.py
 import re
-from evennia.utils.utils import inherits_from
+from functools import lru_cache
+
+from evennia.utils.utils import inherits_from as _evennia_inherits_from
+
+EXIT_PATH = "evennia.objects.objects.DefaultExit"
+CHAR_PATH = "evennia.objects.objects.DefaultCharacter"
+
+@lru_cache(maxsize=None)
+def _class_inherits(cls, parent_path: str) -> bool:
+    return _evennia_inherits_from(cls, parent_path)
+
+def inherits_from(obj, parent_path: str) -> bool:
+    """
+    Evennia's inherits_from, memoized per class: it formats a dotted path for
+    every class in the MRO on each call, and a class's MRO never changes.
+    """
+    return _class_inherits(obj.__class__, parent_path)
 
 def is_exit(obj) -> bool:
-    return bool(obj) and inherits_from(obj, "evennia.objects.objects.DefaultExit")
+    return bool(obj) and inherits_from(obj, EXIT_PATH)
 
 def is_character(obj) -> bool:
-    return bool(obj) and inherits_from(obj, "evennia.objects.objects.DefaultCharacter")
+    return bool(obj) and inherits_from(obj, CHAR_PATH)
 
 def is_prop(obj) -> bool:
     return bool(obj) and (not is_exit(obj)) and (not is_character(obj))
 
 def iter_props(room):
     """Yield every prop (non-exit, non-character) object in a room."""
+    contents_get = getattr(room, "contents_get", None)
+    if contents_get is not None:
+        # Evennia's contents cache already buckets objects by content type,
+        # so this is one in-memory filter instead of two MRO walks per object.
+        for obj in contents_get(content_type="object"):
+            if obj:
+                yield obj
+        return
     for obj in (room.contents or []):
         if obj and is_prop(obj):
             yield obj
 
 def iter_notable_props(room):
     """Yield every notable prop object in a room."""
-    for obj in iter_props(room):
-        if getattr(obj.db, "notable", False):
+    if getattr(room, "contents_get", None) is not None:
+        for obj in iter_props(room):
+            if getattr(obj.db, "notable", False):
+                yield obj
+        return
+    # Without the contents cache, test the cheap notable flag before is_prop's
+    # typeclass checks so those only run for notable objects.
+    for obj in (room.contents or []):
+        if obj and getattr(obj.db, "notable", False) and is_prop(obj):
             yield obj
 
 def find_object_by_dbref(room, dbref):
     """Find an object in the room by its numeric dbref string (e.g. "#67")."""
     target = str(dbref)
+    if target[:1] != "#" or not target[1:].isdigit():
+        # can never equal an obj.dbref; skip the contents scan
+        return None
+    get_cached = getattr(room, "get_cached_instance", None)
+    if get_cached is not None:
+        # Everything in a room's contents is held by the idmapper cache, so
+        # this is a dict lookup instead of a scan (and never a query).
+        obj = get_cached(int(target[1:]))
+        if obj is not None:
+            return obj if obj.location == room else None
     for obj in (room.contents or []):
         if obj and str(obj.dbref) == target:
             return obj
@@ -51,8 +92,15 @@ def find_object_in_room(room, target_text: str, notable_only: bool = False):
     if t.startswith("#") and t[1:].isdigit():
         return find_object_by_dbref(room, t)
 
-    needle = t.lower()
-    candidates = []
+    return _match_prop(room, t.lower(), notable_only=notable_only)
+
+def _match_prop(room, needle: str, notable_only: bool = False):
+    """
+    One pass over the room's props: the first exact key/shortdesc match wins,
+    otherwise the only substring match (None if zero or several).
+    """
+    candidate = None
+    ambiguous = False
     for obj in iter_props(room):
         if notable_only and not getattr(obj.db, "notable", False):
             continue
@@ -62,10 +110,13 @@ def find_object_in_room(room, target_text: str, notable_only: bool = False):
 
         if needle == key or needle == sd:
             return obj
-        if needle in key or (sd and needle in sd):
-            candidates.append(obj)
+        if not ambiguous and (needle in key or (sd and needle in sd)):
+            if candidate is None:
+                candidate = obj
+            else:
+                candidate, ambiguous = None, True
 
-    return candidates[0] if len(candidates) == 1 else None
+    return candidate
 
 def delete_object_by_selector(room, selector: str):
     """
@@ -88,26 +139,9 @@ def delete_object_by_selector(room, selector: str):
             return removed
         return None
 
-    needle = t.lower()
-    # exact match first
-    for obj in iter_props(room):
-        key = (obj.key or "").lower()
-        sd = (obj.db.shortdesc or "").lower()
-        if needle == key or needle == sd:
-            removed = {"key": obj.key, "dbref": str(obj.dbref)}
-            obj.delete()
-            return removed
-
-    # unique substring
-    candidates = []
-    for obj in iter_props(room):
-        key = (obj.key or "").lower()
-        sd = (obj.db.shortdesc or "").lower()
-        if needle in key or (sd and needle in sd):
-            candidates.append(obj)
-
-    if len(candidates) == 1:
-        obj = candidates[0]
+    # exact match first, else unique substring
+    obj = _match_prop(room, t.lower())
+    if obj:
         removed = {"key": obj.key, "dbref": str(obj.dbref)}
         obj.delete()
         return removed
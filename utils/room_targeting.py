@@ -1,13 +1,65 @@
 # utils/room_targeting.py
 import re
+import sys
+from typing import Any, Optional
 
 from utils.room_object_query import find_object_by_dbref, iter_notable_props
 
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# bytes table: A-Z -> a-z, [a-z0-9] kept, every other byte becomes a separator
+_ASCII_WORDS = bytes(
+    c + 32 if 65 <= c <= 90 else c if (97 <= c <= 122 or 48 <= c <= 57) else 32
+    for c in range(256)
+)
+
+def _tokens(s: str) -> list[str]:
+    """
+    Lowercased [a-z0-9]+ runs of `s`, any length.
+    Tokens are interned: rooms reuse a small vocabulary, so the cached object
+    token sets and each instruction's tokens share string objects and set
+    lookups hit the identity check before comparing characters.
+    """
+    s = s or ""
+    intern = sys.intern
+    try:
+        b = s.encode("ascii")
+    except UnicodeEncodeError:
+        return [intern(w) for w in _WORD_RE.findall(s.lower())]
+    # ASCII fast path: lowercase + split in one bytes.translate (a flat table,
+    # no Unicode case mapping) then split, all in C; same tokens as the regex
+    return [intern(w.decode("ascii")) for w in b.translate(_ASCII_WORDS).split()]
+
 def _words(s: str) -> list[str]:
-    s = (s or "").lower()
-    return [w for w in re.findall(r"[a-z0-9]+", s) if len(w) >= 3]
+    return [w for w in _tokens(s) if len(w) >= 3]
+
+_DBREF_RE = re.compile(r"(#\d+)")
+_STOPWORDS = frozenset({
+    "a", "an", "the", "of", "to", "and", "in", "on", "with", "from", "into", "more", "make", "change",
+})
+
+def _object_tokens(obj) -> frozenset[str]:
+    """
+    Name tokens of obj's key + shortdesc (leading article dropped, in the same
+    tokenizing pass).
+    Cached on obj.ndb and recomputed only when key or shortdesc changes.
+    """
+    key = obj.key or ""
+    sd = obj.db.shortdesc or ""
+    ndb = getattr(obj, "ndb", None)
+    cached = ndb.target_tokens if ndb is not None else None
+    if cached is not None and cached[0] == key and cached[1] == sd:
+        return cached[2]
+
+    sd_words = _words(sd)
+    # "a"/"an" are already below _words' length cutoff; drop a leading "the"
+    if sd_words[:1] == ["the"]:
+        del sd_words[0]
+    tokens = frozenset(_words(key)).union(sd_words)
+    if ndb is not None:
+        ndb.target_tokens = (key, sd, tokens)
+    return tokens
 
-def resolve_edit_target(room, instruction: str):
+def resolve_edit_target(room, instruction: str) -> tuple[Optional[Any], list[Any]]:
     """
     Port of SmartRoom._resolve_edit_target, but as a helper:
       returns (target_obj_or_none, ambiguity_list)
@@ -17,32 +69,36 @@ def resolve_edit_target(room, instruction: str):
     if not text:
         return (None, [])
 
-    # explicit dbref anywhere
-    m = re.search(r"(#\d+)", text)
-    if m:
-        dbref = m.group(1)
-        obj = find_object_by_dbref(room, dbref)
-        return (obj, []) if obj else (None, [])
-
-    low = text.lower()
-    scored = []
-    for obj in iter_notable_props(room):
-        key = (obj.key or "").strip()
-        sd = (obj.db.shortdesc or "").strip()
-        sd_no_article = re.sub(r"^(a|an|the)\s+", "", sd, flags=re.IGNORECASE).strip()
-
-        tokens = set(_words(key)) | set(_words(sd_no_article))
-        hits = sum(1 for w in tokens if re.search(rf"\b{re.escape(w)}\b", low))
-        if hits > 0:
-            scored.append((hits, obj))
+    # explicit dbref(s) anywhere: the first one that is in this room wins;
+    # each lookup is a cache hit, not a contents scan
+    dbrefs = _DBREF_RE.findall(text) if "#" in text else ()
+    if dbrefs:
+        for dbref in dict.fromkeys(dbrefs):
+            obj = find_object_by_dbref(room, dbref)
+            if obj:
+                return (obj, [])
+        return (None, [])
 
-    if not scored:
+    # score = number of the object's name tokens that appear as words in the
+    # instruction; tokenize the instruction once and keep the top tier in one pass.
+    # Matching is whole-token, so a hashed set intersection per object is already
+    # a single linear pass; a substring automaton (Aho-Corasick) would buy nothing.
+    instr_tokens = frozenset(_tokens(text))
+    if not instr_tokens:
         return (None, [])
 
-    scored.sort(key=lambda t: t[0], reverse=True)
-    best_score = scored[0][0]
-    best = [o for s, o in scored if s == best_score]
+    best_score = 0
+    best: list[Any] = []
+    tokens_of = _object_tokens  # local: read once, not per object
+    for obj in iter_notable_props(room):
+        hits = len(instr_tokens & tokens_of(obj))
+        if hits > best_score:
+            best_score, best = hits, [obj]
+        elif hits and hits == best_score:
+            best.append(obj)
 
+    if not best:
+        return (None, [])
     if len(best) == 1:
         return (best[0], [])
     return (None, best)
@@ -53,22 +109,11 @@ def instruction_mentions_target(instruction: str, target) -> bool:
     Prevents applying a valid edit to the wrong object when the resolver guesses wrong.
     """
     text = (instruction or "").lower()
-    if re.search(r"(#\d+)", text):
+    if "#" in text and _DBREF_RE.search(text):
         return True  # explicit dbref -> trust it
 
-    key = (target.key or "").lower()
-    sd = (target.db.shortdesc or "").lower()
-    sd = re.sub(r"^(a|an|the)\s+", "", sd).strip()
-
-    # Tokens we allow to count as "mentioned"
-    tokens = set(re.findall(r"[a-z0-9]+", key)) | set(re.findall(r"[a-z0-9]+", sd))
-
-    # prune super-generic tokens that cause false positives
-    stop = {"a", "an", "the", "of", "to", "and", "in", "on", "with", "from", "into", "more", "make", "change"}
-    tokens = {t for t in tokens if len(t) >= 4 and t not in stop}
-
-    # If any meaningful token appears as a whole word in the instruction, we're good.
-    for t in tokens:
-        if re.search(rf"\b{re.escape(t)}\b", text):
-            return True
-    return False
+    # Meaningful name tokens (the cached edit-target tokens, minus short and
+    # super-generic ones that cause false positives) that appear as whole
+    # words in the instruction.
+    mentioned = frozenset(_tokens(text)) & _object_tokens(target)
+    return any(len(t) >= 4 and t not in _STOPWORDS for t in mentioned)
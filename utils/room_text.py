@@ -2,7 +2,12 @@
 import re
 from typing import Optional, Tuple
 
-_COMPUTER_PREFIXES = ("computer ", "computer:", "computer,")
+# addressed == "computer" (any case) followed by one of these separators
+_ADDRESS_WORD = "computer"
+_ADDRESS_SEPS = frozenset(" :,")
+_DBREF_RE = re.compile(r"(#\d+)")
+# every character normalize_say_message can strip from the front
+_LEADING_NOISE = " \t\n\r\x0b\x0c\"',:;"
 
 def normalize_say_message(message: str) -> str:
     msg = str(message or "").strip()
@@ -11,9 +16,23 @@ def normalize_say_message(message: str) -> str:
     # normalize quotes/punctuation similar to current behavior
     return msg.strip(' "\'').lstrip(" ,:;").strip()
 
+def may_be_computer_addressed(message: str) -> bool:
+    """
+    Cheap screen on the raw message, before normalize_say_message: False means
+    it can't be addressed to the computer. Never rejects a message that
+    split_computer_address would accept (the leading-character set is a
+    superset of what normalization strips); True still needs the full check.
+    """
+    head = (message or "").lstrip(_LEADING_NOISE)
+    if head[:1].isspace():
+        return True  # non-ASCII whitespace: leave it to the full check
+    return head[:len(_ADDRESS_WORD)].lower() == _ADDRESS_WORD
+
 def is_computer_addressed(normalized: str) -> bool:
-    low = (normalized or "").lower()
-    return low.startswith(_COMPUTER_PREFIXES)
+    s = normalized or ""
+    n = len(_ADDRESS_WORD)
+    # separator test first: most lines fail it without lowercasing anything
+    return s[n:n + 1] in _ADDRESS_SEPS and s[:n].lower() == _ADDRESS_WORD
 
 def extract_computer_instruction(normalized: str) -> str:
     """
@@ -24,14 +43,25 @@ def extract_computer_instruction(normalized: str) -> str:
         return ""
     if not is_computer_addressed(normalized):
         return ""
-    after = normalized[len("computer"):]
+    after = normalized[len(_ADDRESS_WORD):]
     return after.lstrip(" :,").strip()
 
+def split_computer_address(normalized: str) -> Optional[str]:
+    """
+    One-pass form of is_computer_addressed + extract_computer_instruction:
+    None if the message isn't addressed to the computer, else the instruction
+    text (possibly "").
+    """
+    if not is_computer_addressed(normalized):
+        return None
+    return normalized[len(_ADDRESS_WORD):].lstrip(" :,").strip()
+
 def extract_dbref_anywhere(text: str) -> Optional[str]:
     """
     Find '#123' anywhere in text.
     """
-    if not text:
+    # most lines have no '#': a C-level substring test beats even a compiled search
+    if not text or "#" not in text:
         return None
-    m = re.search(r"(#\d+)", text)
+    m = _DBREF_RE.search(text)
     return m.group(1) if m else None